@@ -3,12 +3,17 @@ Endpoints API pour la gestion des profils utilisateur.
 """
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
+from ..config import settings
 from ..models.profile import ProfileCreate, ProfileUpdate, UserProfile
+from ..services.cv_files import SUPPORTED_EXTENSIONS, CVFileError, CVTooLarge, cv_pool, extract_and_parse, save_upload
 from ..services.cv_parser import cv_parser
-from ..storage.profile_store import profile_store
+from ..storage.profiles import profile_store
 
 
 class ParseCVRequest(BaseModel):
@@ -21,20 +26,12 @@ router = APIRouter(prefix="/api/profile", tags=["profile"])
 @router.post("", response_model=UserProfile, status_code=201)
 def create_profile(profile_data: ProfileCreate) -> UserProfile:
     """Créer un nouveau profil utilisateur."""
-    # Vérifier si profil existe déjà
-    existing = profile_store.get(profile_data.user_id)
-    if existing:
+    # Parser CV si texte fourni : profil et données extraites en une écriture
+    parsed = cv_parser.parse_text(profile_data.cv_text) if profile_data.cv_text else None
+    profile = profile_store.create(profile_data, parsed)
+    if profile is None:
         raise HTTPException(status_code=400, detail="Profile already exists")
     
-    # Parser CV si texte fourni
-    profile = profile_store.create(profile_data)
-    
-    if profile_data.cv_text:
-        parsed = cv_parser.parse_text(profile_data.cv_text)
-        # Mettre à jour avec données parsées
-        update_data = ProfileUpdate(**parsed)
-        profile = profile_store.update(profile.user_id, update_data)
-    
     return profile
 
 
@@ -50,17 +47,15 @@ def get_profile(user_id: str) -> UserProfile:
 @router.put("/{user_id}", response_model=UserProfile)
 def update_profile(user_id: str, update_data: ProfileUpdate) -> UserProfile:
     """Mettre à jour un profil."""
+    # Re-parser CV si texte modifié, avant l'unique écriture
+    if update_data.cv_text:
+        parsed = cv_parser.parse_text(update_data.cv_text)
+        update_data = ProfileUpdate(**{**update_data.model_dump(exclude_unset=True), **parsed})
+    
     profile = profile_store.update(user_id, update_data)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    # Re-parser CV si texte modifié
-    if update_data.cv_text is not None and profile.cv_text:
-        parsed = cv_parser.parse_text(profile.cv_text)
-        # Mettre à jour avec nouvelles données parsées
-        parsed_update = ProfileUpdate(**parsed)
-        profile = profile_store.update(user_id, parsed_update)
-    
     return profile
 
 
@@ -81,46 +76,43 @@ def parse_cv(user_id: str, request: ParseCVRequest) -> dict:
 
 @router.post("/{user_id}/upload-cv", response_model=UserProfile)
 async def upload_cv(user_id: str, file: UploadFile = File(...)) -> UserProfile:
-    """Upload un fichier CV (PDF/DOCX) et parser."""
+    """Upload un fichier CV (PDF/DOCX/TXT) et parser."""
     # Vérifier le type de fichier
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
     
     ext = file.filename.split(".")[-1].lower()
-    if ext not in ["pdf", "docx", "doc", "txt"]:
+    if ext not in SUPPORTED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file type: {ext}. Supported: pdf, docx, doc, txt"
+            detail=f"Unsupported file type: {ext}. Supported: {', '.join(SUPPORTED_EXTENSIONS)}"
+            + (" (convert .doc to .docx or PDF)" if ext == "doc" else ""),
         )
     
-    # Lire le contenu
-    content = await file.read()
+    if not await run_in_threadpool(profile_store.get, user_id):
+        raise HTTPException(status_code=404, detail="Profile not found")
     
-    # Pour MVP: traiter seulement les fichiers texte
-    # TODO: Ajouter parsing PDF/DOCX avec bibliothèques dédiées
-    if ext == "txt":
-        cv_text = content.decode("utf-8", errors="ignore")
-    else:
-        # Pour l'instant, on stocke juste le fichier
-        # TODO: Parser PDF/DOCX
-        raise HTTPException(
-            status_code=501,
-            detail="PDF/DOCX parsing not yet implemented. Please use text format."
-        )
+    # Recopier l'upload (déjà en tampon côté Starlette) dans un fichier temporaire, taille bornée
+    try:
+        path = await run_in_threadpool(save_upload, file, settings.cv_max_mb * 1024 * 1024, f".{ext}")
+    except CVTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     
-    # Mettre à jour le profil avec le CV
-    profile = profile_store.get(user_id)
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
+    # Extraction + parsing hors de la boucle asyncio
+    try:
+        loop = asyncio.get_running_loop()
+        cv_text, parsed = await loop.run_in_executor(cv_pool, extract_and_parse, str(path), ext)
+    except CVFileError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        path.unlink(missing_ok=True)
     
-    update_data = ProfileUpdate(cv_text=cv_text)
-    profile = profile_store.update(user_id, update_data)
+    if not cv_text.strip():
+        raise HTTPException(status_code=422, detail="No text found in CV (scanned PDF?)")
     
-    # Parser le CV
-    if profile:
-        parsed = cv_parser.parse_text(cv_text)
-        parsed_update = ProfileUpdate(**parsed)
-        profile = profile_store.update(user_id, parsed_update)
+    # Texte + données parsées en une seule écriture
+    profile = await run_in_threadpool(profile_store.update, user_id, ProfileUpdate(cv_text=cv_text, **parsed))
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
     
     return profile
-
@@ -2,6 +2,12 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from pathlib import Path
+
+# Données locales par défaut (bases, cache HTTP) : backend/data, quel que soit
+# le répertoire de lancement ; les chemins relatifs passés en variables
+# d'environnement restent relatifs au répertoire courant
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
 
 @dataclass
@@ -12,8 +18,62 @@ class Settings:
     eures_api_key: str | None = os.getenv("EURES_API_KEY")
     openrouter_api_key: str | None = os.getenv("OPENROUTER_API_KEY")
 
-    # DB/infra (remplaçable par Postgres/pgvector)
-    database_url: str = os.getenv("DATABASE_URL", "memory://jobs")
+    # DB/infra (remplaçable par Postgres/pgvector) ; "memory://jobs" pour un store volatile
+    database_url: str = os.getenv("DATABASE_URL", f"sqlite:///{DATA_DIR / 'jobs.db'}")
+
+    # Regroupement des quasi-doublons inter-sources (MinHash/LSH) à l'indexation
+    near_duplicates: bool = os.getenv("NEAR_DUPLICATES", "1") == "1"
+
+    # Recherche sémantique (embeddings + index ANN IVF, 0 = désactivée) : offres
+    # les plus proches du texte de la requête ajoutées aux hits mots-clés comme
+    # candidats, listes IVF parcourues par requête
+    semantic_search: bool = os.getenv("SEMANTIC_SEARCH", "0") == "1"
+    semantic_candidates: int = int(os.getenv("SEMANTIC_CANDIDATES", "1000"))
+    semantic_nprobe: int = int(os.getenv("SEMANTIC_NPROBE", "16"))
+
+    # Cache des classements /search : entrées max (0 = désactivé), TTL (s),
+    # profondeur de classement gardée par entrée
+    search_cache_size: int = int(os.getenv("SEARCH_CACHE_SIZE", "256"))
+    search_cache_ttl: int = int(os.getenv("SEARCH_CACHE_TTL", "300"))
+    search_cache_depth: int = int(os.getenv("SEARCH_CACHE_DEPTH", "500"))
+
+    # Profils : SQLite ("sqlite:///chemin.db") ou "json://dossier" (un fichier par utilisateur)
+    profile_store_url: str = os.getenv("PROFILE_STORE_URL", f"sqlite:///{DATA_DIR / 'profiles.db'}")
+
+    # Profils JSON en cache : intervalle (s) entre deux contrôles du mtime du fichier
+    profile_cache_recheck: float = float(os.getenv("PROFILE_CACHE_RECHECK", "1.0"))
+    # Profils JSON : fenêtre d'écriture différée (s) regroupant les mises à jour, 0 = synchrone
+    profile_write_delay: float = float(os.getenv("PROFILE_WRITE_DELAY", "0.2"))
+
+    # Top-N précalculé par profil sauvegardé (0 = désactivé), intervalle (s) de
+    # prise en compte des écritures d'autres processus (scraping hebdo)
+    profile_matches_depth: int = int(os.getenv("PROFILE_MATCHES_DEPTH", "200"))
+    profile_matches_poll: float = float(os.getenv("PROFILE_MATCHES_POLL", "60"))
+
+    # Upload de CV : taille max (Mo), processus d'extraction PDF/DOCX + parsing
+    cv_max_mb: int = int(os.getenv("CV_MAX_MB", "5"))
+    cv_parse_workers: int = int(os.getenv("CV_PARSE_WORKERS", "2"))
+
+    # Fan-out des connecteurs (threads partagés entre requêtes)
+    fanout_workers: int = int(os.getenv("FANOUT_WORKERS", "16"))
+    # Appels d'une source encore bloqués après leur deadline au-delà desquels elle n'est plus relancée
+    fanout_max_overdue: int = int(os.getenv("FANOUT_MAX_OVERDUE", "2"))
+    # Requêtes simultanées max par site scrapé (Indeed, APEC, ...)
+    host_concurrency: int = int(os.getenv("HOST_CONCURRENCY", "2"))
+    # Cache disque des pages de résultats ("" pour désactiver)
+    http_cache_dir: str = os.getenv("HTTP_CACHE_DIR", str(DATA_DIR / "http_cache"))
+    http_cache_max_mb: int = int(os.getenv("HTTP_CACHE_MAX_MB", "64"))
+
+    # /ingest asynchrone : collectes simultanées, file d'attente max, rétention des résultats (s)
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", "2"))
+    ingest_max_pending: int = int(os.getenv("INGEST_MAX_PENDING", "32"))
+    ingest_result_ttl: int = int(os.getenv("INGEST_RESULT_TTL", "600"))
+
+    # Scraping hebdomadaire : nombre de requêtes WEEKLY_QUERIES traitées en parallèle
+    weekly_workers: int = int(os.getenv("WEEKLY_WORKERS", "4"))
+    # Déduplication sur tout le run : 0 = ensemble exact, sinon filtre de Bloom
+    # dimensionné pour ce nombre d'offres (mémoire fixe, ~0,1 % de faux positifs)
+    dedupe_bloom_capacity: int = int(os.getenv("DEDUPE_BLOOM_CAPACITY", "0"))
 
 
 settings = Settings()
@@ -8,10 +8,18 @@ import re
 from typing import List
 from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
-
 from ..models import JobPosting
+from ..utils.ids import stable_job_id
+from .http_client import http_client
+from .parsing import CardSpec, CardText, card_strainer, parse_html
+
+# Conteneurs de cartes (sélecteurs principaux + fallback) : seuls parsés
+_CARDS = card_strainer([
+    CardSpec("article", css_class="job-card"),
+    CardSpec(css_class="result-item"),
+    CardSpec("li", css_class="offer-item"),
+    CardSpec("article", class_regex=re.compile(r"(offer|job|result)", re.I)),
+])
 
 
 def fetch_jobs(query: str, limit: int = 20) -> List[JobPosting]:
@@ -26,102 +34,7 @@ def fetch_jobs(query: str, limit: int = 20) -> List[JobPosting]:
         # URL de recherche APEC
         url = f"https://www.apec.fr/candidat/recherche-emploi.html/emploi?motsCles={quote_plus(query)}"
         
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
-        }
-        
-        res = requests.get(url, headers=headers, timeout=15)
-        if res.status_code != 200:
-            print(f"[APEC] Status {res.status_code}")
-            return jobs
-        
-        soup = BeautifulSoup(res.text, "html.parser")
-        
-        # APEC structure: chercher les cartes d'offres
-        # Sélecteurs à adapter selon structure réelle (change souvent)
-        job_cards = soup.select("article.job-card, .result-item, li.offer-item")
-        
-        if not job_cards:
-            # Fallback: chercher tout article ou li avec classe contenant "offer" ou "job"
-            job_cards = soup.find_all("article", class_=re.compile(r"(offer|job|result)", re.I))
-        
-        for idx, card in enumerate(job_cards[:limit]):
-            try:
-                # Titre
-                title_el = card.select_one("h3, .job-title, .offer-title, h2.title")
-                title = title_el.get_text(strip=True) if title_el else f"Offre Cadre {idx}"
-                
-                # Entreprise
-                company_el = card.select_one(".company-name, .enterprise, .employer")
-                company = company_el.get_text(strip=True) if company_el else "Entreprise"
-                
-                # Localisation
-                location_el = card.select_one(".location, .job-location, .place")
-                location = location_el.get_text(strip=True) if location_el else "France"
-                city = location.split(",")[0].strip() if location else "Paris"
-                
-                # Lien
-                link_el = card.select_one("a[href*='/offre/']")
-                if not link_el:
-                    link_el = card.find("a", href=True)
-                
-                href = link_el.get("href", "") if link_el else ""
-                apply_url = f"https://www.apec.fr{href}" if href.startswith("/") else href or "https://www.apec.fr"
-                
-                # ID unique depuis URL
-                job_id = f"apec-{idx}"
-                if "numIdOffre=" in href:
-                    match = re.search(r"numIdOffre=(\d+)", href)
-                    if match:
-                        job_id = f"apec-{match.group(1)}"
-                
-                # Description courte (si présente)
-                desc_el = card.select_one(".description, .job-description, p")
-                description = desc_el.get_text(strip=True)[:200] if desc_el else f"{title} chez {company}"
-                
-                # Parser salaire (APEC affiche souvent des fourchettes)
-                salary_text = card.get_text()
-                salary_min, salary_max = _extract_salary_apec(salary_text)
-                
-                # Type de contrat (CDI majoritaire sur APEC)
-                contract_type = "CDI"
-                if "CDD" in salary_text.upper():
-                    contract_type = "CDD"
-                elif "FREELANCE" in salary_text.upper() or "INDÉPENDANT" in salary_text.upper():
-                    contract_type = "Freelance"
-                
-                # Remote
-                remote_type = "onsite"
-                text_lower = card.get_text().lower()
-                if "télétravail" in text_lower or "remote" in text_lower or "100% télétravail" in text_lower:
-                    remote_type = "remote"
-                elif "hybride" in text_lower or "partiel" in text_lower:
-                    remote_type = "hybrid"
-                
-                jobs.append(
-                    JobPosting(
-                        id=job_id,
-                        source="apec",
-                        source_job_id=job_id,
-                        title=title,
-                        company=company,
-                        country="fr",
-                        city=city,
-                        remote_type=remote_type,
-                        contract_type=contract_type,
-                        salary_min=salary_min,
-                        salary_max=salary_max,
-                        currency="EUR" if salary_min else None,
-                        salary_period="year" if salary_min else None,
-                        apply_url=apply_url,
-                        description=description,
-                    )
-                )
-            except Exception as e:
-                print(f"[APEC] Error parsing card {idx}: {e}")
-                continue
+        jobs = http_client.get_parsed(url, profile="apec", parse=_parse_page)[:limit]
         
         print(f"[APEC] Scraped {len(jobs)} jobs")
     
@@ -131,6 +44,104 @@ def fetch_jobs(query: str, limit: int = 20) -> List[JobPosting]:
     return jobs
 
 
+def _parse_page(html: str) -> List[JobPosting]:
+    """Extrait les offres d'une page de résultats APEC."""
+    jobs = []
+    soup = parse_html(html, _CARDS)
+
+    # APEC structure: chercher les cartes d'offres
+    # Sélecteurs à adapter selon structure réelle (change souvent)
+    job_cards = soup.select("article.job-card, .result-item, li.offer-item")
+
+    if not job_cards:
+        # Fallback: chercher tout article ou li avec classe contenant "offer" ou "job"
+        job_cards = soup.find_all("article", class_=re.compile(r"(offer|job|result)", re.I))
+
+    for idx, card in enumerate(job_cards):
+        try:
+            # Titre
+            title_el = card.select_one("h3, .job-title, .offer-title, h2.title")
+            title = title_el.get_text(strip=True) if title_el else ""
+            if not title:
+                # Carte sans titre : ignorée (un titre de repli positionnel donnerait un id de contenu positionnel)
+                continue
+
+            # Entreprise
+            company_el = card.select_one(".company-name, .enterprise, .employer")
+            company = company_el.get_text(strip=True) if company_el else "Entreprise"
+
+            # Localisation
+            location_el = card.select_one(".location, .job-location, .place")
+            location = location_el.get_text(strip=True) if location_el else "France"
+            city = location.split(",")[0].strip() if location else "Paris"
+
+            # Lien
+            link_el = card.select_one("a[href*='/offre/']")
+            if not link_el:
+                link_el = card.find("a", href=True)
+
+            href = link_el.get("href", "") if link_el else ""
+            apply_url = f"https://www.apec.fr{href}" if href.startswith("/") else href or "https://www.apec.fr"
+
+            # ID stable : numIdOffre, sinon URL de l'offre, sinon contenu
+            match = re.search(r"numIdOffre=(\d+)", href)
+            job_id = stable_job_id(
+                "apec",
+                native=match.group(1) if match else None,
+                url=apply_url,
+                content=(title, company, city),
+            )
+
+            # Description courte (si présente)
+            desc_el = card.select_one(".description, .job-description, p")
+            description = desc_el.get_text(strip=True)[:200] if desc_el else f"{title} chez {company}"
+
+            # Texte de la carte extrait une seule fois (salaire, contrat, remote)
+            text = CardText(card)
+
+            # Parser salaire (APEC affiche souvent des fourchettes)
+            salary_min, salary_max = _extract_salary_apec(text.raw)
+
+            # Type de contrat (CDI majoritaire sur APEC)
+            contract_type = "CDI"
+            if "CDD" in text.upper:
+                contract_type = "CDD"
+            elif "FREELANCE" in text.upper or "INDÉPENDANT" in text.upper:
+                contract_type = "Freelance"
+
+            # Remote
+            remote_type = "onsite"
+            text_lower = text.lower
+            if "télétravail" in text_lower or "remote" in text_lower or "100% télétravail" in text_lower:
+                remote_type = "remote"
+            elif "hybride" in text_lower or "partiel" in text_lower:
+                remote_type = "hybrid"
+
+            jobs.append(
+                JobPosting(
+                    id=job_id,
+                    source="apec",
+                    source_job_id=job_id[len("apec-"):],
+                    title=title,
+                    company=company,
+                    country="fr",
+                    city=city,
+                    remote_type=remote_type,
+                    contract_type=contract_type,
+                    salary_min=salary_min,
+                    salary_max=salary_max,
+                    currency="EUR" if salary_min else None,
+                    salary_period="year" if salary_min else None,
+                    apply_url=apply_url,
+                    description=description,
+                )
+            )
+        except Exception as e:
+            print(f"[APEC] Error parsing card {idx}: {e}")
+            continue
+    return jobs
+
+
 def _extract_salary_apec(text: str) -> tuple[int | None, int | None]:
     """
     Parse salaire depuis texte APEC.
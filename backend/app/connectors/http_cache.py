@@ -0,0 +1,165 @@
+"""
+Cache disque des pages de résultats (revalidation ETag/Last-Modified).
+
+Chaque URL donne deux fichiers compressés (zlib) dans le dossier du cache :
+- `<clé>.meta` : métadonnées HTTP + offres déjà extraites de la page
+- `<clé>.body` : HTML brut, pour re-parser après un 304 si besoin
+
+Tant que le TTL de la source n'est pas écoulé, les offres sont servies depuis
+`.meta` sans réseau ni parsing HTML. Les offres extraites ne sont réutilisées
+que si elles l'ont été par la version courante des parseurs (PARSER_VERSION) ;
+sinon la page est re-parsée (depuis `.body` après un 304). Le cache est borné en taille : les entrées
+les moins récemment utilisées (mtime de `.meta`) sont évincées en premier.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# À incrémenter à chaque changement des parseurs de connecteurs ou du calcul
+# des ids : les offres extraites par une version précédente sont ignorées
+PARSER_VERSION = 3
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    fetched_at: float
+    ttl: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    parsed: Optional[List[Dict[str, Any]]] = None
+    # Version des parseurs ayant produit `parsed` (0 : entrée d'avant le versionnage)
+    parser_version: int = 0
+
+    def current_parsed(self) -> Optional[List[Dict[str, Any]]]:
+        """Offres extraites, None si absentes ou produites par d'autres parseurs."""
+        return self.parsed if self.parser_version == PARSER_VERSION else None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) - self.fetched_at < self.ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Cache HTTP sur disque, partageable entre processus (écritures atomiques)."""
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None  # clé -> taille, ordre LRU
+        self._size = 0
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.directory / f"{key}.meta", self.directory / f"{key}.body"
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for meta in self.directory.glob("*.meta"):
+                try:
+                    stat = meta.stat()
+                    body = meta.with_suffix(".body")
+                    size = stat.st_size + (body.stat().st_size if body.exists() else 0)
+                    entries.append((stat.st_mtime, meta.stem, size))
+                except FileNotFoundError:
+                    continue
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._size = sum(self._index.values())
+        return self._index
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        key = self._key(url)
+        meta_path, _ = self._paths(key)
+        try:
+            raw = json.loads(zlib.decompress(meta_path.read_bytes()))
+        except (FileNotFoundError, zlib.error, ValueError):
+            return None
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+        try:
+            os.utime(meta_path)  # LRU persistant entre processus
+        except FileNotFoundError:
+            pass
+        return CacheEntry(**raw)
+
+    def body(self, url: str) -> Optional[str]:
+        _, body_path = self._paths(self._key(url))
+        try:
+            return zlib.decompress(body_path.read_bytes()).decode("utf-8")
+        except (FileNotFoundError, zlib.error):
+            return None
+
+    def put(self, entry: CacheEntry, body: Optional[str] = None) -> None:
+        key = self._key(entry.url)
+        meta_path, body_path = self._paths(key)
+        meta = zlib.compress(json.dumps(entry.__dict__, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            index = self._load_index()
+            self._write_atomic(meta_path, meta)
+            if body is not None:
+                self._write_atomic(body_path, zlib.compress(body.encode("utf-8")))
+            body_size = body_path.stat().st_size if body_path.exists() else 0
+            self._size += len(meta) + body_size - index.pop(key, 0)
+            index[key] = len(meta) + body_size
+            self._evict(index)
+
+    def _evict(self, index: "OrderedDict[str, int]") -> None:
+        while self._size > self.max_bytes and len(index) > 1:
+            key, size = index.popitem(last=False)
+            self._size -= size
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def clear(self) -> int:
+        """Supprime toutes les entrées ; renvoie leur nombre."""
+        with self._lock:
+            index = self._load_index()
+            count = len(index)
+            for path in list(self.directory.glob("*.meta")) + list(self.directory.glob("*.body")):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            index.clear()
+            self._size = 0
+        return count
+
+    def size(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._size
@@ -0,0 +1,318 @@
+"""
+Client HTTP partagé par les connecteurs de scraping.
+
+- une `requests.Session` par hôte, avec pool de connexions keep-alive
+- politique de retry/backoff commune (429/5xx, erreurs de connexion)
+- décompression gzip/deflate (+ br si `brotli` est installé)
+- en-têtes par défaut par connecteur (profils)
+- plafond de requêtes simultanées et délai minimal par hôte
+- compteurs par hôte : requêtes, nouvelles connexions, réutilisation, temps de handshake
+- deadline par appel de connecteur (`call_deadline`, posée par le fan-out) :
+  l'attente d'un créneau sur l'hôte et le timeout de chaque requête sont
+  bornés par le temps restant
+- cache disque avec revalidation conditionnelle (`get_parsed`, cf. http_cache)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from ..config import settings
+from ..models import JobPosting
+from ..utils.ratelimit import host_limiter
+from .http_cache import PARSER_VERSION, CacheEntry, HttpCache
+
+BROWSER_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+@dataclass(frozen=True)
+class ConnectorProfile:
+    """En-têtes, timeout, délai minimal entre deux requêtes et TTL du cache (s)."""
+    headers: Dict[str, str]
+    timeout: float = 10.0
+    min_interval: float = 0.0
+    cache_ttl: float = 6 * 3600
+
+
+PROFILES: Dict[str, ConnectorProfile] = {
+    "wttj": ConnectorProfile(
+        headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+    ),
+    "remotive": ConnectorProfile(headers={"User-Agent": "Mozilla/5.0"}),
+    "apec": ConnectorProfile(
+        headers={
+            "User-Agent": BROWSER_UA,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
+        },
+        timeout=15.0,
+        cache_ttl=12 * 3600,
+    ),
+    # Headers réalistes pour éviter blocage ; 1s entre deux requêtes pour être sympa
+    "indeed": ConnectorProfile(
+        headers={
+            "User-Agent": BROWSER_UA,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+            "Accept-Language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
+            "DNT": "1",
+            "Upgrade-Insecure-Requests": "1",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-Site": "none",
+        },
+        timeout=15.0,
+        min_interval=1.0,
+        cache_ttl=3 * 3600,
+    ),
+}
+
+RETRY_POLICY = Retry(
+    total=2,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    connections: int = 0
+    handshake_seconds: float = 0.0
+    cache_hits: int = 0
+    not_modified: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.connections,
+            "reused_connections": max(0, self.requests - self.connections),
+            "handshake_seconds": round(self.handshake_seconds, 3),
+            "cache_hits": self.cache_hits,
+            "not_modified": self.not_modified,
+        }
+
+
+_deadline = threading.local()
+
+
+@contextmanager
+def call_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Borne les requêtes du thread courant à `seconds` secondes (None : pas de borne)."""
+    previous = getattr(_deadline, "at", None)
+    _deadline.at = None if seconds is None else time.monotonic() + seconds
+    try:
+        yield
+    finally:
+        _deadline.at = previous
+
+
+def _time_left(url: str) -> Optional[float]:
+    at = getattr(_deadline, "at", None)
+    if at is None:
+        return None
+    remaining = at - time.monotonic()
+    if remaining <= 0:
+        raise requests.Timeout(f"Deadline dépassée avant la requête {url}")
+    return remaining
+
+
+_stats: Dict[str, HostStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _host_stats(host: str) -> HostStats:
+    with _stats_lock:
+        stats = _stats.get(host)
+        if stats is None:
+            stats = _stats[host] = HostStats()
+        return stats
+
+
+def _record_connect(host: str, seconds: float) -> None:
+    stats = _host_stats(host)
+    with stats._lock:
+        stats.connections += 1
+        stats.handshake_seconds += seconds
+
+
+# Connexions instrumentées : chaque connect() = un nouveau handshake TCP (+TLS)
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()
+        _record_connect(self.host, time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()
+        _record_connect(self.host, time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """Sessions keep-alive par hôte, partagées entre threads."""
+
+    def __init__(self, cache: HttpCache | None = None) -> None:
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._next_slot: Dict[str, float] = {}
+        self.cache = cache
+
+    def _session(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = _PooledAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.host_concurrency,
+                    max_retries=RETRY_POLICY,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+                self._sessions[host] = session
+            return session
+
+    def _wait_turn(self, host: str, min_interval: float) -> None:
+        """Espace les requêtes vers un même hôte d'au moins `min_interval` secondes."""
+        if min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = start + min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def get(self, url: str, profile: str, **kwargs) -> requests.Response:
+        conf = PROFILES[profile]
+        host = urlsplit(url).hostname or ""
+        headers = dict(conf.headers)
+        headers.update(kwargs.pop("headers", None) or {})
+        kwargs.setdefault("timeout", conf.timeout)
+
+        # Attente d'un créneau (appel lent sur le même hôte) bornée par la deadline
+        with host_limiter.slot(host, _time_left(url)):
+            self._wait_turn(host, conf.min_interval)
+            # Attente du créneau comprise : timeout réduit au temps restant de l'appel
+            remaining = _time_left(url)
+            if remaining is not None:
+                kwargs["timeout"] = min(kwargs["timeout"], remaining)
+            stats = _host_stats(host)
+            with stats._lock:
+                stats.requests += 1
+            return self._session(host).get(url, headers=headers, **kwargs)
+
+    def get_parsed(
+        self, url: str, profile: str, parse: Callable[[str], List[JobPosting]]
+    ) -> List[JobPosting]:
+        """GET + parsing, avec cache disque des offres extraites.
+
+        Entrée fraîche : aucune requête ni parsing. Entrée expirée : GET
+        conditionnel, un 304 réutilise les offres déjà extraites. Des offres
+        extraites par une autre version des parseurs ne sont jamais servies :
+        la page est revalidée, et re-parsée depuis le HTML stocké sur un 304.
+        """
+        if self.cache is None:
+            res = self.get(url, profile)
+            if res.status_code != 200:
+                print(f"[{profile}] Status {res.status_code}")
+                return []
+            return parse(res.text)
+
+        conf = PROFILES[profile]
+        stats = _host_stats(urlsplit(url).hostname or "")
+        entry = self.cache.get(url)
+        parsed = entry.current_parsed() if entry else None
+        if parsed is not None and entry.is_fresh():
+            with stats._lock:
+                stats.cache_hits += 1
+            return [JobPosting.model_validate(d) for d in parsed]
+
+        # Offres à re-parser sans HTML stocké : un 304 serait inexploitable
+        body = self.cache.body(url) if entry and parsed is None else None
+        if entry and parsed is None and body is None:
+            entry = None
+        res = self.get(url, profile, headers=entry.conditional_headers() if entry else None)
+        now = time.time()
+        if res.status_code == 304 and entry:
+            with stats._lock:
+                stats.not_modified += 1
+            if parsed is not None:
+                jobs = [JobPosting.model_validate(d) for d in parsed]
+            else:
+                jobs = parse(body)
+            self._store(url, conf, entry.etag, entry.last_modified, jobs, now)
+            return jobs
+        if res.status_code != 200:
+            print(f"[{profile}] Status {res.status_code}")
+            return []
+
+        jobs = parse(res.text)
+        self._store(
+            url, conf, res.headers.get("ETag"), res.headers.get("Last-Modified"), jobs, now, res.text
+        )
+        return jobs
+
+    def _store(self, url, conf, etag, last_modified, jobs, now, body=None) -> None:
+        entry = CacheEntry(
+            url=url,
+            fetched_at=now,
+            ttl=conf.cache_ttl,
+            etag=etag,
+            last_modified=last_modified,
+            parsed=[job.model_dump(mode="json") for job in jobs],
+            parser_version=PARSER_VERSION,
+        )
+        try:
+            self.cache.put(entry, body)
+        except OSError as e:
+            print(f"[HttpCache] Write error: {e}")
+
+    def stats(self) -> Dict[str, dict]:
+        with _stats_lock:
+            return {host: s.as_dict() for host, s in _stats.items()}
+
+
+http_client = HttpClient(
+    HttpCache(settings.http_cache_dir, settings.http_cache_max_mb * 1024 * 1024)
+    if settings.http_cache_dir
+    else None
+)
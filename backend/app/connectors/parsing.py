@@ -0,0 +1,82 @@
+"""
+Couche de parsing HTML commune aux connecteurs de scraping.
+
+- backend lxml (C) au lieu de html.parser (pur Python)
+- parsing partiel façon SoupStrainer : seuls les conteneurs de cartes (et
+  leur contenu) sont construits, le reste de la page est ignoré
+- texte d'une carte extrait une seule fois puis réutilisé (salaire, contrat, remote)
+"""
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Iterable, Optional, Pattern, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+PARSER = "lxml"
+
+
+def _classes(attrs) -> Tuple[str, ...]:
+    value = attrs.get("class") or ""
+    return tuple(value.split()) if isinstance(value, str) else tuple(value)
+
+
+class CardSpec:
+    """Conteneur de carte : nom de balise, classe exacte, regex sur classes, attribut.
+
+    Une carte matche si tous les critères renseignés matchent.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        css_class: Optional[str] = None,
+        class_regex: Optional[Pattern[str]] = None,
+        attr: Optional[str] = None,
+        attr_value: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.css_class = css_class
+        self.class_regex = class_regex
+        self.attr = attr
+        self.attr_value = attr_value
+
+    def matches(self, name: str, attrs) -> bool:
+        if self.name and name != self.name:
+            return False
+        if self.css_class or self.class_regex:
+            classes = _classes(attrs)
+            if self.css_class and self.css_class not in classes:
+                return False
+            if self.class_regex and not any(self.class_regex.search(c) for c in classes):
+                return False
+        if self.attr:
+            value = attrs.get(self.attr)
+            if value is None or (self.attr_value is not None and value != self.attr_value):
+                return False
+        return True
+
+
+def card_strainer(specs: Iterable[CardSpec]) -> SoupStrainer:
+    specs = list(specs)
+    return SoupStrainer(lambda name, attrs: any(spec.matches(name, attrs) for spec in specs))
+
+
+def parse_html(html: str, strainer: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse avec lxml ; si `strainer` est fourni, ne construit que les cartes."""
+    return BeautifulSoup(html, PARSER, parse_only=strainer)
+
+
+class CardText:
+    """Texte brut d'une carte, calculé une fois (et ses variantes casse)."""
+
+    def __init__(self, card: Tag) -> None:
+        self.raw = card.get_text()
+
+    @cached_property
+    def lower(self) -> str:
+        return self.raw.lower()
+
+    @cached_property
+    def upper(self) -> str:
+        return self.raw.upper()
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api import profile as profile_api
-from .models import SearchRequest, SearchResponse
-from .services.pipeline import pipeline
+from .models import IngestStatus, SearchRequest, SearchResponse
+from .services.ingest_jobs import IngestQueueFull, ingest_jobs
+from .services.pipeline import pipeline, search_cache
+from .services.profile_matches import apply_profile, is_profile_only, profile_matches
+from .storage.profiles import profile_store
 
 app = FastAPI(title="Job Search Engine", version="0.1.0")
 
@@ -21,44 +24,63 @@ app.add_middleware(
 # Inclure les routers
 app.include_router(profile_api.router)
 
+# Top-N précalculé des profils sauvegardés (thread de fond)
+profile_matches.start()
+
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
-@app.post("/ingest", response_model=SearchResponse)
-def ingest(req: SearchRequest):
-    jobs = pipeline.harvest(req)
-    return SearchResponse(total=len(jobs), items=jobs)
+@app.post("/ingest", response_model=IngestStatus, status_code=202)
+async def ingest(req: SearchRequest):
+    """Lance une collecte en tâche de fond et renvoie son id (suivi via GET /ingest/{job_id})."""
+    try:
+        job = ingest_jobs.submit(req)
+    except IngestQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_status()
+
+
+@app.get("/ingest/{job_id}", response_model=IngestStatus)
+async def ingest_status(job_id: str):
+    """Statut d'une collecte ; `result` contient les offres collectées une fois terminée."""
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return job.to_status()
+
+
+@app.get("/search/cache")
+def search_cache_stats():
+    """Compteurs du cache des classements (hits, misses, requêtes fusionnées)."""
+    return search_cache.stats()
 
 
 @app.post("/search", response_model=SearchResponse)
-def search(req: SearchRequest, user_id: str | None = Query(None, description="ID utilisateur pour utiliser le profil sauvegardé")):
+def search(
+    req: SearchRequest,
+    user_id: str | None = Query(None, description="ID utilisateur pour utiliser le profil sauvegardé"),
+    limit: int = Query(50, ge=1, le=500, description="Taille de page"),
+    offset: int = Query(0, ge=0, description="Décalage (ignoré si cursor fourni)"),
+    cursor: str | None = Query(None, description="Curseur renvoyé par la page précédente"),
+):
     """Recherche d'emploi avec option d'utiliser le profil utilisateur."""
-    from ..storage.profile_store import profile_store
-    
-    # Si user_id fourni, charger le profil et enrichir la requête
+    # Si user_id fourni, enrichir la requête avec le profil (entrées précalculées, en cache)
+    precomputed = None
     if user_id:
-        profile = profile_store.get(user_id)
-        if profile:
-            # Utiliser le profil pour enrichir la recherche
-            if not req.cv_summary and profile.to_cv_summary():
-                req.cv_summary = profile.to_cv_summary()
-            
-            # Utiliser les préférences du profil si non spécifiées
-            if not req.contract_types and profile.preferred_contract_types:
-                req.contract_types = profile.preferred_contract_types
-            
-            if not req.remote_preference and profile.preferred_remote:
-                req.remote_preference = profile.preferred_remote
-            
-            if not req.salary_min and profile.salary_min:
-                req.salary_min = profile.salary_min
-            
-            if not req.countries and profile.preferred_countries:
-                req.countries = profile.preferred_countries
+        cached = profile_store.get_cached(user_id)
+        if cached:
+            # Aucun autre critère : top-N précalculé du profil, s'il est à jour
+            if is_profile_only(req):
+                precomputed = lambda key, version: profile_matches.lookup(user_id, key, version)  # noqa: E731
+            # Préférences du profil pour les champs non spécifiés
+            apply_profile(req, cached)
     
-    jobs = pipeline.search(req)
-    return SearchResponse(total=len(jobs), items=jobs)
+    try:
+        page = pipeline.search_page(req, limit=limit, offset=offset, cursor=cursor, precomputed=precomputed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SearchResponse(total=page.total, items=page.items, next_cursor=page.next_cursor)
 
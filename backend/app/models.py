@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -52,10 +52,37 @@ class SearchRequest(BaseModel):
     cv_summary: Optional[str] = Field(
         default=None, description="Résumé texte du CV (compétences, secteurs, années)"
     )
+    sources: List[str] = Field(
+        default_factory=list, description="Limiter à ces sources (indeed, apec, ...)"
+    )
+    strict_filters: bool = Field(
+        default=False,
+        description="Exclure (au lieu de pénaliser) les offres hors pays/contrat/remote/salaire",
+    )
+    ranking: Literal["keywords", "bm25"] = Field(
+        default="keywords",
+        description="keywords : part des mots-clés trouvés ; bm25 : pertinence BM25F (titre, skills, description)",
+    )
 
 
 class SearchResponse(BaseModel):
     total: int
     items: List[JobPosting]
+    missing_sources: List[str] = Field(
+        default_factory=list,
+        description="Sources sans réponse dans leur deadline (résultats partiels)",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None, description="Curseur de la page suivante (None si dernière page)"
+    )
 
 
+class IngestStatus(BaseModel):
+    job_id: str
+    status: str = Field(description="pending|running|done|error")
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[SearchResponse] = Field(
+        default=None, description="Offres collectées (quand status=done)"
+    )
@@ -12,21 +12,18 @@ Usage:
 """
 from __future__ import annotations
 
-import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 
-from ..connectors import (
-    fetch_adzuna,
-    fetch_eures,
-    fetch_france_travail,
-    fetch_scraping,
-)
-from ..connectors.apec import fetch_jobs as fetch_apec
-from ..connectors.indeed import fetch_jobs as fetch_indeed
-from ..models import JobPosting
-from ..storage.memory import store
-from ..utils.dedupe import deduplicate
+from ..config import settings
+from ..connectors.http_client import http_client
+from ..services.fanout import fan_out
+from ..services.pipeline import source_calls
+from ..storage.jobs import store
+from ..utils.dedupe import BloomFilter, HashSet, SeenHashes, deduplicate
 
 
 # Configuration des requêtes à lancer chaque semaine
@@ -65,35 +62,82 @@ WEEKLY_QUERIES = [
 
 
 class WeeklyScraper:
-    """Scrapeur hebdomadaire."""
+    """Scrapeur hebdomadaire.
+
+    `workers` requêtes sont traitées en parallèle (1 = mode séquentiel) ; la
+    concurrence par site reste plafonnée par `settings.host_concurrency`.
+    La déduplication est commune à toutes les requêtes du run : une offre
+    renvoyée par plusieurs requêtes n'est traitée qu'une fois.
+    """
     
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or settings.weekly_workers)
         self.total_scraped = 0
+        self.total_unique = 0
         self.total_stored = 0
+        self.total_new = 0
+        self.total_changed = 0
+        self.total_unchanged = 0
         self.errors = []
+        self.query_timings: List[dict] = []
+        self.source_timings: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._seen: SeenHashes = (
+            BloomFilter(settings.dedupe_bloom_capacity) if settings.dedupe_bloom_capacity else HashSet()
+        )
     
     def run(self):
         """Lance le scraping complet."""
-        print(f"[WeeklyScraper] Starting at {datetime.now()}")
+        print(f"[WeeklyScraper] Starting at {datetime.now()} ({self.workers} workers)")
+        start = time.perf_counter()
+        started_at = time.time()
         
-        for query_config in WEEKLY_QUERIES:
-            try:
-                self._scrape_query(query_config)
-            except Exception as e:
-                self.errors.append(f"Query {query_config}: {e}")
-                print(f"[WeeklyScraper] Error: {e}")
+        if self.workers == 1:
+            for query_config in WEEKLY_QUERIES:
+                self._run_query(query_config)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="weekly") as pool:
+                list(pool.map(self._run_query, WEEKLY_QUERIES))
         
-        print(f"[WeeklyScraper] Finished!")
+        elapsed = time.perf_counter() - start
+        # Offres du store non revues pendant ce run (disparues des sources)
+        expired = store.count_unseen_since(started_at)
+        print(f"[WeeklyScraper] Finished in {elapsed:.1f}s!")
         print(f"  - Total scraped: {self.total_scraped}")
+        print(f"  - Total unique: {self.total_unique}")
         print(f"  - Total stored: {self.total_stored}")
+        print(
+            f"  - New: {self.total_new}, changed: {self.total_changed}, "
+            f"unchanged: {self.total_unchanged}, expired: {expired}"
+        )
         print(f"  - Errors: {len(self.errors)}")
         
         return {
             "scraped": self.total_scraped,
+            "unique": self.total_unique,
             "stored": self.total_stored,
+            "new": self.total_new,
+            "changed": self.total_changed,
+            "unchanged": self.total_unchanged,
+            "expired": expired,
             "errors": self.errors,
+            "timings": {
+                "total_seconds": round(elapsed, 3),
+                "workers": self.workers,
+                "queries": self.query_timings,
+                "sources": self.source_timings,
+                "http": http_client.stats(),
+            },
         }
     
+    def _run_query(self, query_config: dict):
+        try:
+            self._scrape_query(query_config)
+        except Exception as e:
+            with self._lock:
+                self.errors.append(f"Query {query_config}: {e}")
+            print(f"[WeeklyScraper] Error: {e}")
+    
     def _scrape_query(self, config: dict):
         """Scrape une requête spécifique."""
         keywords = config["keywords"]
@@ -101,60 +145,65 @@ class WeeklyScraper:
         country = countries[0]
         
         print(f"[WeeklyScraper] Scraping: {keywords} ({country})")
+        start = time.perf_counter()
         
-        jobs: List[JobPosting] = []
-        
-        # 1. API stubs (France Travail, Adzuna, EURES)
-        try:
-            jobs.extend(fetch_france_travail(keywords))
-        except Exception as e:
-            print(f"  [FT] {e}")
-        
-        try:
-            jobs.extend(fetch_adzuna(keywords, country=country))
-        except Exception as e:
-            print(f"  [Adzuna] {e}")
-        
-        try:
-            jobs.extend(fetch_eures(keywords, country=country))
-        except Exception as e:
-            print(f"  [EURES] {e}")
-        
-        # 2. Scraping générique (WTTJ, Remotive)
-        try:
-            jobs.extend(fetch_scraping(keywords, country=country))
-        except Exception as e:
-            print(f"  [Scraping] {e}")
-        
-        # 3. APEC (cadres France)
-        if country == "fr":
-            try:
-                jobs.extend(fetch_apec(keywords, limit=15))
-            except Exception as e:
-                print(f"  [APEC] {e}")
-        
-        # 4. Indeed (avec délai pour éviter rate limit)
-        try:
-            location = "France" if country == "fr" else country.upper()
-            jobs.extend(fetch_indeed(keywords, location=location, limit=15))
-        except Exception as e:
-            print(f"  [Indeed] {e}")
+        # 1-4. Toutes les sources de la requête en parallèle (API stubs,
+        # WTTJ/Remotive, APEC si France, Indeed), sans deadline en tâche de fond
+        result = fan_out(source_calls(keywords, country, deadlines=False))
+        jobs = result.jobs
+        for outcome in result.outcomes:
+            if outcome.status != "ok":
+                print(f"  [{outcome.name}] {outcome.error or outcome.status}")
         
-        self.total_scraped += len(jobs)
+        # 5. Déduplication sur tout le run (offres déjà vues par une autre requête écartées)
+        unique_jobs = deduplicate(jobs, self._seen)
         
-        # 5. Déduplication
-        unique_jobs = deduplicate(jobs)
+        # 6. Stockage incrémental : seules les offres nouvelles/modifiées sont écrites
+        diff = store.merge_jobs(unique_jobs)
         
-        # 6. Stockage
-        store.upsert_jobs(unique_jobs)
-        self.total_stored += len(unique_jobs)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.total_scraped += len(jobs)
+            self.total_unique += len(unique_jobs)
+            self.total_stored += len(diff.written)
+            self.total_new += len(diff.new)
+            self.total_changed += len(diff.changed)
+            self.total_unchanged += len(diff.unchanged)
+            self.query_timings.append(
+                {
+                    "keywords": keywords,
+                    "country": country,
+                    "seconds": round(elapsed, 3),
+                    "scraped": len(jobs),
+                    "unique": len(unique_jobs),
+                    "new": len(diff.new),
+                    "changed": len(diff.changed),
+                    "unchanged": len(diff.unchanged),
+                    "sources": {
+                        o.name: {"status": o.status, "seconds": round(o.elapsed, 3), "jobs": len(o.jobs)}
+                        for o in result.outcomes
+                    },
+                }
+            )
+            for o in result.outcomes:
+                stats = self.source_timings.setdefault(
+                    o.name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "jobs": 0, "failures": 0}
+                )
+                stats["calls"] += 1
+                stats["seconds"] = round(stats["seconds"] + o.elapsed, 3)
+                stats["max_seconds"] = round(max(stats["max_seconds"], o.elapsed), 3)
+                stats["jobs"] += len(o.jobs)
+                stats["failures"] += o.status != "ok"
         
-        print(f"  → {len(jobs)} scraped, {len(unique_jobs)} unique")
+        print(
+            f"  → {len(jobs)} scraped, {len(unique_jobs)} unique "
+            f"({len(diff.new)} new, {len(diff.changed)} changed, {len(diff.unchanged)} unchanged, {elapsed:.1f}s)"
+        )
 
 
-def run_weekly_scraper():
+def run_weekly_scraper(workers: Optional[int] = None):
     """Point d'entrée pour lancer le scraper."""
-    scraper = WeeklyScraper()
+    scraper = WeeklyScraper(workers=workers)
     return scraper.run()
 
 
@@ -163,7 +212,9 @@ if __name__ == "__main__":
     result = run_weekly_scraper()
     print("\n=== SUMMARY ===")
     print(f"Scraped: {result['scraped']}")
+    print(f"Unique: {result['unique']}")
     print(f"Stored: {result['stored']}")
+    print(f"New: {result['new']}, changed: {result['changed']}, unchanged: {result['unchanged']}, expired: {result['expired']}")
     if result['errors']:
         print(f"Errors: {len(result['errors'])}")
         for err in result['errors'][:5]:
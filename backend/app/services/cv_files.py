@@ -0,0 +1,104 @@
+"""
+Extraction du texte des CV uploadés (PDF, DOCX, TXT).
+
+Starlette a déjà reçu et mis en tampon tout l'upload (SpooledTemporaryFile)
+avant l'appel de la route : il n'y a pas de streaming. L'upload est recopié
+par blocs dans un fichier temporaire nommé (lu par pypdf / python-docx dans
+un autre processus), avec une taille max (`settings.cv_max_mb`) au-delà de
+laquelle il est refusé ; cette copie bloquante tourne dans le threadpool.
+Extraction et parsing (pypdf / python-docx puis cv_parser) sont
+du travail CPU : ils tournent dans un pool de processus
+(`settings.cv_parse_workers`) pour ne pas bloquer la boucle asyncio.
+
+Le format .doc (Word binaire) n'est pas géré par python-docx : il faut le
+convertir en .docx ou en PDF.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Tuple
+
+from fastapi import UploadFile
+
+from ..config import settings
+from .cv_parser import cv_parser
+
+SUPPORTED_EXTENSIONS = ("pdf", "docx", "txt")
+CHUNK_SIZE = 64 * 1024
+
+
+class CVFileError(Exception):
+    pass
+
+
+class CVTooLarge(CVFileError):
+    pass
+
+
+def save_upload(file: UploadFile, max_bytes: int, suffix: str = "") -> Path:
+    """Copie l'upload (déjà en tampon) dans un fichier temporaire ; CVTooLarge au-delà de max_bytes.
+
+    I/O bloquantes : à appeler via run_in_threadpool.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise CVTooLarge(f"File too large (max {max_bytes // (1024 * 1024)} MB)")
+    fd, name = tempfile.mkstemp(prefix="cv-", suffix=suffix)
+    path = Path(name)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            file.file.seek(0)
+            while chunk := file.file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise CVTooLarge(f"File too large (max {max_bytes // (1024 * 1024)} MB)")
+                out.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def _pdf_text(path: str) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _docx_text(path: str) -> str:
+    import docx
+
+    document = docx.Document(path)
+    lines = [p.text for p in document.paragraphs]
+    # Beaucoup de CV mettent compétences / expériences dans des tableaux
+    for table in document.tables:
+        for row in table.rows:
+            lines.append(" | ".join(cell.text for cell in row.cells))
+    return "\n".join(lines)
+
+
+def extract_text(path: str, ext: str) -> str:
+    try:
+        if ext == "pdf":
+            return _pdf_text(path)
+        if ext == "docx":
+            return _docx_text(path)
+        if ext == "txt":
+            return Path(path).read_bytes().decode("utf-8", errors="ignore")
+    except Exception as e:
+        raise CVFileError(f"Unreadable {ext} file: {e}") from None
+    raise CVFileError(f"Unsupported file type: {ext}")
+
+
+def extract_and_parse(path: str, ext: str) -> Tuple[str, dict[str, Any]]:
+    """Texte du CV et données extraites (exécuté dans le pool de processus)."""
+    cv_text = extract_text(path, ext)
+    return cv_text, cv_parser.parse_text(cv_text)
+
+
+# Pool global (processus démarrés au premier CV)
+cv_pool = ProcessPoolExecutor(max_workers=settings.cv_parse_workers)
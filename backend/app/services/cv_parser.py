@@ -1,143 +1,187 @@
 """
 Service de parsing de CV (texte et fichiers).
+
+Compétences, langues, niveaux et secteurs sont cherchés en une seule passe :
+tous les mots du vocabulaire sont fusionnés en une expression régulière
+compilée à l'import (alternance factorisée en arbre de préfixes, un seul
+caractère testé par position). À chaque position on récupère le mot le plus
+long du vocabulaire, puis ceux qui en sont des préfixes, et on vérifie pour
+chacun la règle de sa catégorie : mot entier (\\b ... \\b) pour les
+compétences, langues et niveaux, simple sous-chaîne pour les secteurs.
 """
 from __future__ import annotations
 
 import re
-from typing import Any
+from typing import Any, Dict, Iterable, List, Tuple
+
+SKILL_KEYWORDS = (
+    # Langages
+    "python", "java", "javascript", "typescript", "node.js", "nodejs", "go", "golang", "rust", "c++", "c#",
+    "php", "ruby", "swift", "kotlin", "dart", "scala", "clojure", "haskell", "elixir", "erlang",
+    # Cloud / infra
+    "kubernetes", "docker", "terraform", "ansible", "jenkins", "gitlab", "github", "aws", "azure", "gcp", "cloud",
+    # Bases de données
+    "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "kafka", "rabbitmq", "sql", "nosql",
+    # Frontend
+    "react", "vue", "angular", "svelte", "next.js", "nextjs", "nuxt", "gatsby", "remix",
+    # Data / IA
+    "machine learning", "ml", "ai", "deep learning", "nlp", "computer vision", "tensorflow", "pytorch",
+    # Méthodes
+    "devops", "sre", "ci/cd", "agile", "scrum", "kanban",
+)
+
+LANGUAGES = {
+    "anglais": "Anglais",
+    "english": "Anglais",
+    "français": "Français",
+    "french": "Français",
+    "allemand": "Allemand",
+    "german": "Allemand",
+    "espagnol": "Espagnol",
+    "spanish": "Espagnol",
+    "italien": "Italien",
+    "italian": "Italian",
+    "chinois": "Chinois",
+    "chinese": "Chinese",
+    "japonais": "Japonais",
+    "japanese": "Japanese",
+}
+
+# Par ordre de priorité : le premier niveau présent l'emporte
+LEVELS = (
+    ("Junior", ("junior", "débutant", "beginner", "entry")),
+    ("Mid", ("mid", "intermédiaire", "intermediate", "confirmé")),
+    ("Senior", ("senior", "expert", "lead", "architect", "principal")),
+)
+
+SECTORS = {
+    "fintech": ("fintech", "finance", "banking", "banque"),
+    "e-commerce": ("e-commerce", "ecommerce", "retail", "commerce"),
+    "healthcare": ("healthcare", "santé", "médical", "health"),
+    "edtech": ("edtech", "éducation", "education", "formation"),
+    "saas": ("saas", "software as a service"),
+    "gaming": ("gaming", "jeu", "game"),
+}
+
+EXPERIENCE_PATTERNS = [
+    re.compile(r"(\d+)\s*(?:ans?|years?|années?)\s*(?:d'?expérience|of experience|exp)", re.IGNORECASE),
+    re.compile(r"expérience\s*:\s*(\d+)", re.IGNORECASE),
+    re.compile(r"(\d+)\+?\s*(?:ans?|years?)", re.IGNORECASE),
+]
+
+SKILL, LANGUAGE, LEVEL, SECTOR = "skill", "language", "level", "sector"
+
+
+def _build_vocabulary() -> Dict[str, List[Tuple[str, str]]]:
+    """Mot -> [(catégorie, valeur normalisée)]."""
+    vocab: Dict[str, List[Tuple[str, str]]] = {}
+
+    def add(word: str, kind: str, value: str) -> None:
+        entries = vocab.setdefault(word, [])
+        if (kind, value) not in entries:
+            entries.append((kind, value))
+
+    for word in SKILL_KEYWORDS:
+        skill = word.replace(".", "").replace(" ", "")
+        if len(skill) > 2:  # Filtrer les matches trop courts (ml, ai, go, c#)
+            add(word, SKILL, skill)
+    for word, language in LANGUAGES.items():
+        add(word, LANGUAGE, language)
+    for level, words in LEVELS:
+        for word in words:
+            add(word, LEVEL, level)
+    for sector, words in SECTORS.items():
+        for word in words:
+            add(word, SECTOR, sector)
+    return vocab
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Alternance factorisée par préfixes communs, branches longues d'abord.
+
+    Chaque branche de premier niveau consomme un caractère et capture la suite
+    dans un lookahead : les correspondances se chevauchent (« information »
+    contient « formation ») et chaque position ne teste qu'un caractère.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def subpattern(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + subpattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        alternation = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Fin de mot possible ici : le ? glouton préfère le mot le plus long
+            return "(?:" + alternation + ")?" if len(branches) == 1 else alternation + "?"
+        return alternation
+
+    return "|".join(
+        f"{re.escape(char)}(?=({subpattern(child)}))" for char, child in sorted(trie.items())
+    )
+
+
+_VOCABULARY = _build_vocabulary()
+# Mot -> mots du vocabulaire qui en sont des préfixes (lui compris), du plus long au plus court
+_PREFIXES = {
+    word: sorted((w for w in _VOCABULARY if word.startswith(w)), key=len, reverse=True)
+    for word in _VOCABULARY
+}
+_VOCABULARY_RE = re.compile(_trie_pattern(_VOCABULARY))
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _boundary(text: str, pos: int) -> bool:
+    """Équivalent de \\b à la position `pos`."""
+    before = pos > 0 and _is_word(text[pos - 1])
+    after = pos < len(text) and _is_word(text[pos])
+    return before != after
 
 
 class CVParser:
     """Parser de CV pour extraire compétences, expérience, etc."""
-    
-    # Patterns pour extraction
-    SKILL_PATTERNS = [
-        r"\b(python|java|javascript|typescript|react|vue|angular|node\.?js|go|golang|rust|c\+\+|c#|php|ruby|swift|kotlin|dart|scala|clojure|haskell|elixir|erlang)\b",
-        r"\b(kubernetes|docker|terraform|ansible|jenkins|gitlab|github|aws|azure|gcp|cloud)\b",
-        r"\b(postgresql|mysql|mongodb|redis|elasticsearch|kafka|rabbitmq|sql|nosql)\b",
-        r"\b(react|vue|angular|svelte|next\.?js|nuxt|gatsby|remix)\b",
-        r"\b(machine learning|ml|ai|deep learning|nlp|computer vision|tensorflow|pytorch)\b",
-        r"\b(devops|sre|ci/cd|agile|scrum|kanban)\b",
-    ]
-    
-    EXPERIENCE_PATTERNS = [
-        r"(\d+)\s*(?:ans?|years?|années?)\s*(?:d'?expérience|of experience|exp)",
-        r"expérience\s*:\s*(\d+)",
-        r"(\d+)\+?\s*(?:ans?|years?)",
-    ]
-    
-    LANGUAGE_PATTERNS = [
-        r"\b(anglais|english|français|french|allemand|german|espagnol|spanish|italien|italian|chinois|chinese|japonais|japanese)\b",
-    ]
-    
-    LEVEL_PATTERNS = [
-        (r"\b(junior|débutant|beginner|entry)\b", "Junior"),
-        (r"\b(mid|intermédiaire|intermediate|confirmé)\b", "Mid"),
-        (r"\b(senior|expert|lead|architect|principal)\b", "Senior"),
-    ]
-    
+
     def parse_text(self, cv_text: str) -> dict[str, Any]:
         """Parser un CV en texte pour extraire les informations."""
-        text_lower = cv_text.lower()
-        
-        # Extraire compétences
-        skills = self._extract_skills(text_lower)
-        
-        # Extraire années d'expérience
-        experience_years = self._extract_experience(cv_text)
-        
-        # Extraire niveau
-        experience_level = self._extract_level(text_lower)
-        
-        # Extraire langues
-        languages = self._extract_languages(text_lower)
-        
-        # Extraire secteurs (basique)
-        sectors = self._extract_sectors(text_lower)
-        
+        found = self._scan(cv_text.lower())
+
         return {
-            "skills": skills,
-            "experience_years": experience_years,
-            "experience_level": experience_level,
-            "languages": languages,
-            "sectors": sectors,
+            "skills": sorted(found[SKILL]),
+            "experience_years": self._extract_experience(cv_text),
+            "experience_level": next((level for level, _ in LEVELS if level in found[LEVEL]), None),
+            "languages": sorted(found[LANGUAGE]),
+            "sectors": [sector for sector in SECTORS if sector in found[SECTOR]],
         }
-    
-    def _extract_skills(self, text: str) -> list[str]:
-        """Extraire les compétences techniques."""
-        skills = set()
-        
-        for pattern in self.SKILL_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                skill = match.lower() if isinstance(match, str) else match[0].lower()
-                # Normaliser
-                skill = skill.replace(".", "").replace(" ", "")
-                if len(skill) > 2:  # Filtrer les matches trop courts
-                    skills.add(skill)
-        
-        return sorted(list(skills))
-    
+
+    def _scan(self, text: str) -> Dict[str, set]:
+        """Une passe sur le texte : valeurs trouvées par catégorie."""
+        found: Dict[str, set] = {SKILL: set(), LANGUAGE: set(), LEVEL: set(), SECTOR: set()}
+        for match in _VOCABULARY_RE.finditer(text):
+            start = match.start()
+            longest = match.group(0) + match.group(match.lastindex)
+            for word in _PREFIXES[longest]:
+                for kind, value in _VOCABULARY[word]:
+                    if kind == SECTOR or (_boundary(text, start) and _boundary(text, start + len(word))):
+                        found[kind].add(value)
+        return found
+
     def _extract_experience(self, text: str) -> int | None:
         """Extraire les années d'expérience."""
-        for pattern in self.EXPERIENCE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in EXPERIENCE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 years = int(match.group(1))
                 # Limiter à 50 ans (réaliste)
                 return min(years, 50)
         return None
-    
-    def _extract_level(self, text: str) -> str | None:
-        """Extraire le niveau d'expérience."""
-        for pattern, level in self.LEVEL_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                return level
-        return None
-    
-    def _extract_languages(self, text: str) -> list[str]:
-        """Extraire les langues."""
-        languages = set()
-        
-        for pattern in self.LANGUAGE_PATTERNS:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                lang = match.lower()
-                # Normaliser
-                lang_map = {
-                    "anglais": "Anglais",
-                    "english": "Anglais",
-                    "français": "Français",
-                    "french": "Français",
-                    "allemand": "Allemand",
-                    "german": "Allemand",
-                    "espagnol": "Espagnol",
-                    "spanish": "Espagnol",
-                }
-                languages.add(lang_map.get(lang, lang.capitalize()))
-        
-        return sorted(list(languages))
-    
-    def _extract_sectors(self, text: str) -> list[str]:
-        """Extraire les secteurs d'activité (basique)."""
-        sectors = []
-        
-        sector_keywords = {
-            "fintech": ["fintech", "finance", "banking", "banque"],
-            "e-commerce": ["e-commerce", "ecommerce", "retail", "commerce"],
-            "healthcare": ["healthcare", "santé", "médical", "health"],
-            "edtech": ["edtech", "éducation", "education", "formation"],
-            "saas": ["saas", "software as a service"],
-            "gaming": ["gaming", "jeu", "game"],
-        }
-        
-        for sector, keywords in sector_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                sectors.append(sector)
-        
-        return sectors
 
 
 # Instance globale
 cv_parser = CVParser()
-
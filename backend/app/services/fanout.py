@@ -0,0 +1,149 @@
+"""
+Exécution concurrente des connecteurs (fan-out) avec deadline par source.
+
+Chaque source tourne dans un pool de threads ; à l'expiration de sa
+deadline, la source est marquée manquante et on renvoie les résultats
+partiels des autres sources sans attendre la retardataire.
+
+- La deadline court à partir du démarrage effectif de l'appel (pas de sa
+  soumission) : un appel resté en file derrière d'autres n'est pas compté
+  en retard. Il n'attend son tour que le temps de sa deadline ; au-delà il
+  est annulé sans avoir tourné.
+- Elle borne aussi le travail lui-même : les requêtes HTTP de l'appel ont
+  un timeout réduit au temps restant (http_client.call_deadline), le thread
+  est donc libéré peu après.
+- Une source dont `fanout_max_overdue` appels tournent encore après leur
+  deadline (hôte qui ne répond plus) est marquée manquante sans être
+  relancée : quelques hôtes bloqués ne peuvent pas occuper tout le pool.
+- Les appels sans deadline (scraping hebdo) ont leur propre pool.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from ..config import settings
+from ..connectors.http_client import call_deadline
+from ..models import JobPosting
+
+
+@dataclass
+class SourceCall:
+    """Appel d'un connecteur : nom de source, fonction sans argument, deadline (s)."""
+    name: str
+    fn: Callable[[], List[JobPosting]]
+    deadline: Optional[float] = None
+
+
+@dataclass
+class SourceOutcome:
+    """Résultat d'une source : ok | timeout | error."""
+    name: str
+    status: str
+    jobs: List[JobPosting] = field(default_factory=list)
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class FanOutResult:
+    outcomes: List[SourceOutcome] = field(default_factory=list)
+
+    @property
+    def jobs(self) -> List[JobPosting]:
+        jobs: List[JobPosting] = []
+        for outcome in self.outcomes:
+            jobs.extend(outcome.jobs)
+        return jobs
+
+    @property
+    def missing_sources(self) -> List[str]:
+        return [o.name for o in self.outcomes if o.status != "ok"]
+
+    def timings(self) -> Dict[str, float]:
+        return {o.name: round(o.elapsed, 3) for o in self.outcomes}
+
+
+# Pool des appels avec deadline (/search, /ingest), pool des tâches de fond
+_executor = ThreadPoolExecutor(max_workers=settings.fanout_workers, thread_name_prefix="fanout")
+_background_executor = ThreadPoolExecutor(max_workers=settings.fanout_workers, thread_name_prefix="fanout-bg")
+
+# Appels encore en cours après leur deadline, par source
+_overdue: Dict[str, int] = {}
+_overdue_lock = threading.Lock()
+
+
+class _Started:
+    """Instant de démarrage d'un appel dans le pool (posé par _timed)."""
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.at = 0.0
+
+
+def _timed(call: SourceCall, started: _Started) -> tuple[List[JobPosting], float]:
+    started.at = time.perf_counter()
+    started.event.set()
+    with call_deadline(call.deadline):
+        jobs = call.fn()
+    return jobs, time.perf_counter() - started.at
+
+
+def _mark_overdue(name: str, future: Future) -> None:
+    with _overdue_lock:
+        _overdue[name] = _overdue.get(name, 0) + 1
+
+    def release(_: Future) -> None:
+        with _overdue_lock:
+            _overdue[name] -= 1
+
+    future.add_done_callback(release)
+
+
+def _saturated(name: str) -> bool:
+    with _overdue_lock:
+        return _overdue.get(name, 0) >= settings.fanout_max_overdue
+
+
+def fan_out(calls: List[SourceCall]) -> FanOutResult:
+    """Lance toutes les sources en parallèle et attend chacune jusqu'à sa deadline."""
+    submitted = []
+    for call in calls:
+        if call.deadline is not None and _saturated(call.name):
+            submitted.append((call, None, None))
+            continue
+        started = _Started()
+        executor = _executor if call.deadline is not None else _background_executor
+        submitted.append((call, started, executor.submit(_timed, call, started)))
+
+    outcomes: List[SourceOutcome] = []
+    for call, started, future in submitted:
+        if future is None:
+            print(f"[FanOut] {call.name}: appels précédents encore bloqués, source ignorée")
+            outcomes.append(SourceOutcome(call.name, "timeout", error="source saturée"))
+            continue
+        try:
+            remaining = None
+            if call.deadline is not None:
+                # Attente du démarrage (file du pool) bornée par la deadline
+                if not started.event.wait(call.deadline):
+                    if future.cancel():
+                        print(f"[FanOut] {call.name}: pas démarrée en {call.deadline}s (pool saturé)")
+                        outcomes.append(SourceOutcome(call.name, "timeout", error="pool saturé"))
+                        continue
+                    started.event.wait()
+                remaining = max(0.0, started.at + call.deadline - time.perf_counter())
+            jobs, elapsed = future.result(timeout=remaining)
+            outcomes.append(SourceOutcome(call.name, "ok", jobs, elapsed))
+        except FutureTimeout:
+            _mark_overdue(call.name, future)
+            print(f"[FanOut] {call.name}: deadline {call.deadline}s dépassée")
+            outcomes.append(SourceOutcome(call.name, "timeout", elapsed=call.deadline or 0.0))
+        except Exception as e:
+            print(f"[FanOut] {call.name}: {e}")
+            elapsed = time.perf_counter() - started.at if started.event.is_set() else 0.0
+            outcomes.append(SourceOutcome(call.name, "error", elapsed=elapsed, error=str(e)))
+    return FanOutResult(outcomes)
@@ -0,0 +1,112 @@
+"""
+Collectes /ingest en tâche de fond.
+
+POST /ingest renvoie tout de suite un id de job ; la collecte (réseau,
+pauses entre requêtes) tourne dans un pool borné (`settings.ingest_workers`)
+au lieu d'occuper un thread du serveur. Deux requêtes identiques pour la
+collecte (même requête connecteurs + pays, cf. harvest_query) pendant qu'un
+job est en attente ou en cours sont fusionnées : elles reçoivent le même job.
+Les jobs terminés sont conservés `settings.ingest_result_ttl` secondes.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from ..config import settings
+from ..models import IngestStatus, SearchRequest, SearchResponse
+from .pipeline import HarvestResult, harvest_query, pipeline
+
+
+class IngestQueueFull(Exception):
+    pass
+
+
+@dataclass
+class IngestJob:
+    id: str
+    key: Tuple[str, str]
+    status: str = "pending"
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    result: Optional[HarvestResult] = None
+    error: Optional[str] = None
+    # Horloge monotone de fin, pour l'expiration
+    done_at: Optional[float] = None
+
+    def to_status(self) -> IngestStatus:
+        result = None
+        if self.result is not None:
+            result = SearchResponse(
+                total=len(self.result.jobs),
+                items=self.result.jobs,
+                missing_sources=self.result.missing_sources,
+            )
+        return IngestStatus(
+            job_id=self.id,
+            status=self.status,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            error=self.error,
+            result=result,
+        )
+
+
+class IngestJobs:
+    def __init__(self, workers: int, max_pending: int, result_ttl: float) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, IngestJob] = {}
+        # Jobs en attente / en cours par clé de collecte (fusion des doublons)
+        self._active: Dict[Tuple[str, str], IngestJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, req: SearchRequest) -> IngestJob:
+        key = harvest_query(req)
+        with self._lock:
+            self._expire()
+            job = self._active.get(key)
+            if job is not None:
+                return job
+            if len(self._active) >= self.max_pending:
+                raise IngestQueueFull(f"Too many pending ingest jobs ({self.max_pending})")
+            job = IngestJob(id=uuid.uuid4().hex, key=key)
+            self._jobs[job.id] = job
+            self._active[key] = job
+        self._executor.submit(self._run, job, req)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def _run(self, job: IngestJob, req: SearchRequest) -> None:
+        job.status = "running"
+        try:
+            job.result = pipeline.harvest(req)
+            job.status = "done"
+        except Exception as e:
+            print(f"[Ingest] Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = "error"
+        finally:
+            job.finished_at = datetime.now()
+            job.done_at = time.monotonic()
+            with self._lock:
+                self._active.pop(job.key, None)
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.result_ttl
+        expired = [i for i, j in self._jobs.items() if j.done_at is not None and j.done_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+ingest_jobs = IngestJobs(settings.ingest_workers, settings.ingest_max_pending, settings.ingest_result_ttl)
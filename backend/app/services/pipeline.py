@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from typing import List
+import base64
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from ..connectors import (
     fetch_adzuna,
@@ -10,45 +16,233 @@ from ..connectors import (
     fetch_indeed,
     fetch_scraping,
 )
+from ..config import settings
 from ..models import JobPosting, SearchRequest
-from ..storage.memory import store
+from ..storage.jobs import store
 from ..utils.dedupe import deduplicate
-from ..utils.scoring import score_job
+from ..utils.embeddings import semantic_query
+from ..utils.scoring import ScoredJob, cv_keyword_score, materialize
+from ..utils.vector_scoring import ROW_BITS, cursor_after, score_rows, sort_key, top_k
+from .fanout import SourceCall, fan_out
+from .search_cache import ResultCache, request_key
 
+# Deadline par source (secondes) : au-delà, la source est déclarée manquante
+# et /ingest répond avec les résultats partiels des autres.
+SOURCE_DEADLINES: Dict[str, float] = {
+    "france_travail": 5.0,
+    "adzuna": 5.0,
+    "eures": 5.0,
+    "scraping": 12.0,
+    "apec": 12.0,
+    "indeed": 12.0,
+}
 
-class Pipeline:
-    def harvest(self, req: SearchRequest) -> List[JobPosting]:
-        query = " ".join(req.keywords) if req.keywords else "developpeur"
-        country = req.countries[0] if req.countries else "fr"
-        jobs: List[JobPosting] = []
-        
+
+@dataclass
+class HarvestResult:
+    jobs: List[JobPosting] = field(default_factory=list)
+    missing_sources: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class Ranking:
+    """Début d'un classement : clés, rangs, scores et part mots-clés dans l'ordre."""
+    keys: np.ndarray
+    rows: np.ndarray
+    scores: np.ndarray
+    kw: np.ndarray
+    total: int
+    # Candidats après le curseur éventuel (>= len(keys))
+    remaining: int
+
+    @property
+    def complete(self) -> bool:
+        return len(self.keys) == self.remaining
+
+
+@dataclass
+class SearchPage:
+    items: List[JobPosting]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(key: Tuple[float, int]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Clé de tri (-score, rang) de la dernière offre renvoyée ; ValueError si invalide."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        neg_score, row = json.loads(raw)
+        neg_score, row = float(neg_score), int(row)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    # Hors bornes, la clé entière (sort_key) déborderait ou serait corrompue
+    if not math.isfinite(neg_score) or not 0 <= row < 1 << ROW_BITS:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return neg_score, row
+
+
+def source_calls(query: str, country: str, deadlines: bool = True) -> List[SourceCall]:
+    """Construit la liste des connecteurs à interroger pour une requête.
+
+    `deadlines=False` pour les traitements de fond (scraping hebdo) où l'on
+    préfère attendre une source lente plutôt que la perdre.
+    """
+    calls = [
         # APIs (stubs)
-        jobs.extend(fetch_france_travail(query))
-        jobs.extend(fetch_adzuna(query, country=country))
-        jobs.extend(fetch_eures(query, country=country))
-        
+        SourceCall("france_travail", lambda: fetch_france_travail(query)),
+        SourceCall("adzuna", lambda: fetch_adzuna(query, country=country)),
+        SourceCall("eures", lambda: fetch_eures(query, country=country)),
         # Scraping actif
-        jobs.extend(fetch_scraping(query, country=country))
-        
-        # APEC (France uniquement)
-        if country == "fr":
-            jobs.extend(fetch_apec(query, limit=15))
-        
-        # Indeed (avec location)
-        location = "France" if country == "fr" else country.upper()
-        jobs.extend(fetch_indeed(query, location=location, limit=15))
-        
-        unique = deduplicate(jobs)
-        store.upsert_jobs(unique)
-        return unique
+        SourceCall("scraping", lambda: fetch_scraping(query, country=country)),
+    ]
+    # APEC (France uniquement)
+    if country == "fr":
+        calls.append(SourceCall("apec", lambda: fetch_apec(query, limit=15)))
+    # Indeed (avec location)
+    location = "France" if country == "fr" else country.upper()
+    calls.append(SourceCall("indeed", lambda: fetch_indeed(query, location=location, limit=15)))
+
+    for call in calls:
+        call.deadline = SOURCE_DEADLINES.get(call.name) if deadlines else None
+    return calls
+
+
+def semantic_candidates(rows: np.ndarray, text: str, kw: Optional[np.ndarray]) -> np.ndarray:
+    """Réduit les candidats (triés) aux hits mots-clés et aux offres proches du texte (ANN).
+
+    Le représentant de quasi-doublons d'une offre proche reste candidat.
+    """
+    near = store.semantic_rows(text, settings.semantic_candidates, rows)
+    keep = [near, store.columns.canonical[near]]
+    if kw is not None:
+        keep.append(np.flatnonzero(kw))
+    return rows[np.isin(rows, np.concatenate(keep))]
+
+
+def harvest_query(req: SearchRequest) -> Tuple[str, str]:
+    """(requête, pays) envoyés aux connecteurs : seuls champs qui influent sur la collecte."""
+    query = " ".join(req.keywords) if req.keywords else "developpeur"
+    country = req.countries[0] if req.countries else "fr"
+    return query, country
+
+
+class Pipeline:
+    def harvest(self, req: SearchRequest) -> HarvestResult:
+        query, country = harvest_query(req)
+
+        # Toutes les sources en parallèle : la latence = la source la plus lente
+        result = fan_out(source_calls(query, country))
+
+        unique = deduplicate(result.jobs)
+        # Offres déjà connues et inchangées : pas de réécriture
+        store.merge_jobs(unique)
+        return HarvestResult(unique, result.missing_sources, result.timings())
 
     def search(self, req: SearchRequest) -> List[JobPosting]:
-        # In real impl: vector search + filtres SQL; ici in-memory
-        jobs = store.search()
-        scored = [score_job(job, req) for job in jobs]
-        scored.sort(key=lambda j: j.match_score or 0, reverse=True)
-        return scored
+        """Classement complet (toutes les offres candidates)."""
+        return self.search_page(req, limit=None).items
+
+    def _rank(
+        self,
+        req: SearchRequest,
+        depth: Optional[int],
+        cv_score: float,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Ranking:
+        """Les `depth` premières offres du classement (toutes si None), après le curseur `after`."""
+        # Hits mots-clés (ou pertinence BM25F) depuis l'index inversé ; score CV calculé une fois
+        if req.ranking == "bm25":
+            kw = store.bm25_vector(req.keywords)
+        else:
+            kw = store.keyword_vector(req.keywords)
+        rows = store.candidate_rows(req)
+        # Recherche sémantique : génération de candidats par l'index ANN, puis
+        # classement par score_rows comme les autres
+        text = semantic_query(req)
+        if text is not None:
+            rows = semantic_candidates(rows, text, kw)
+        # Quasi-doublons inter-sources : seul le représentant est scoré et affiché
+        rows = store.collapse_duplicates(rows)
+        scored = score_rows(store.columns, rows, req, kw, cv_score)
+
+        keys = scored.keys
+        keep = np.flatnonzero(cursor_after(keys, after)) if after else None
+        if keep is not None:
+            keys = keys[keep]
+        order = top_k(keys, depth)
+        if keep is not None:
+            order = keep[order]
+        return Ranking(
+            scored.keys[order], scored.rows[order], scored.scores[order], scored.kw[order],
+            total=len(rows), remaining=len(keys),
+        )
+
+    def search_page(
+        self,
+        req: SearchRequest,
+        limit: Optional[int] = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        precomputed: Optional[Callable[[str, int], Optional[Ranking]]] = None,
+    ) -> SearchPage:
+        """Une page du classement, par offset ou par curseur.
+
+        Ordre : score décroissant puis rang d'insertion. Le curseur encode la
+        clé de la dernière offre renvoyée : les pages suivantes restent stables
+        quand de nouvelles offres arrivent. Le scoring est vectorisé sur les
+        colonnes du store (vector_scoring) et la sélection top-k se fait par
+        argpartition sur une clé entière (score, rang).
+
+        Les `search_cache_depth` premières offres de chaque classement sont
+        mises en cache (search_cache) ; une page au-delà est recalculée.
+        `precomputed(clé, version)` peut fournir ce début de classement à la
+        place du cache (top-N précalculé d'un profil, cf. profile_matches).
+        """
+        after = decode_cursor(cursor) if cursor else None
+        if after:
+            offset = 0
+        need = None if limit is None else offset + limit
+        cv_score = cv_keyword_score(req)
+
+        store.refresh()
+        version = store.version
+        key = request_key(req, cv_score)
+        ranking = precomputed(key, version) if precomputed else None
+        if ranking is None:
+            ranking = search_cache.get_or_compute(
+                key, version, lambda: self._rank(req, settings.search_cache_depth, cv_score)
+            )
+        # Début de la page dans le classement en cache (suffixe après le curseur)
+        start = int(np.searchsorted(ranking.keys, sort_key(-after[0], after[1]), side="right")) if after else 0
+        available = len(ranking.keys) - start
+        if ranking.complete or (need is not None and available >= need):
+            has_more = need is not None and (available > need or not ranking.complete)
+        else:
+            ranking = self._rank(req, need, cv_score, after)
+            start = 0
+            has_more = need is not None and ranking.remaining > need
+
+        stop = None if need is None else start + need
+        window = slice(start + offset, stop)
+        page = [
+            ScoredJob(store.job_id(int(r)), float(sc), float(k))
+            for r, sc, k in zip(ranking.rows[window], ranking.scores[window], ranking.kw[window])
+        ]
+        next_cursor = None
+        if page and has_more:
+            last = page[-1]
+            next_cursor = encode_cursor((-last.score, store.row(last.job_id)))
+
+        # Seule la page renvoyée est matérialisée en JobPosting
+        items = [materialize(store.get(s.job_id), s, req) for s in page]
+        return SearchPage(items, ranking.total, next_cursor)
 
 
+search_cache = ResultCache(settings.search_cache_size, settings.search_cache_ttl)
 pipeline = Pipeline()
 
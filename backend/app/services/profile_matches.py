@@ -0,0 +1,215 @@
+"""
+Top-N précalculé des offres pour chaque profil sauvegardé.
+
+`/search?user_id=...` sans autre critère que le profil donne toujours la même
+requête (résumé CV, contrats, remote, salaire, pays du profil) : son début de
+classement (`settings.profile_matches_depth` offres) est calculé en tâche de
+fond et servi sans scorer le corpus.
+
+- Profils : recalcul complet à la création / mise à jour (listener du store
+  de profils). Les profils dont la requête est identique partagent la liste.
+- Offres : le store signale les rangs touchés à chaque écriture (y compris
+  celles d'un autre processus, vues par `store.refresh()` que le thread de
+  fond appelle toutes les `profile_matches_poll` secondes, par ex. après le
+  scraping hebdo). Seuls ces rangs sont rescorés puis fusionnés dans chaque
+  liste ; une liste tronquée ne garde que les clés sous son ancienne borne
+  (les offres non touchées au-delà peuvent les devancer) et est recalculée
+  entièrement si elle devient trop courte.
+- Une liste n'est servie que si elle reflète la version courante du store ;
+  sinon /search prend le chemin normal (cache de classements).
+
+Seules les clés de tri sont gardées (rang et score y sont encodés) : ~8 octets
+par offre et par liste.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+import numpy as np
+
+from ..config import settings
+from ..models import SearchRequest
+from ..storage.jobs import store
+from ..storage.profile_store import CachedProfile
+from ..storage.profiles import profile_store
+from ..utils.embeddings import semantic_query
+from ..utils.scoring import cv_keyword_score
+from ..utils.vector_scoring import decode_keys, score_rows, top_k
+from .pipeline import Ranking, pipeline
+from .search_cache import request_key
+
+
+def apply_profile(req: SearchRequest, cached: CachedProfile) -> SearchRequest:
+    """Complète la requête avec le profil (champs non renseignés uniquement)."""
+    profile, inputs = cached.profile, cached.inputs
+    if not req.cv_summary and inputs.cv_summary:
+        req.cv_summary = inputs.cv_summary
+    # Contrats tels quels : ils apparaissent dans les raisons du score
+    if not req.contract_types and profile.preferred_contract_types:
+        req.contract_types = list(profile.preferred_contract_types)
+    if not req.remote_preference and inputs.remote:
+        req.remote_preference = inputs.remote
+    if not req.salary_min and inputs.salary_min:
+        req.salary_min = inputs.salary_min
+    if not req.countries and inputs.countries:
+        req.countries = list(inputs.countries)
+    return req
+
+
+def is_profile_only(req: SearchRequest) -> bool:
+    """Requête sans aucun critère : seul le profil la définit."""
+    return req == SearchRequest()
+
+
+@dataclass
+class MatchList:
+    req: SearchRequest
+    cv_score: float
+    # Clés de tri (score, rang) du début du classement, croissantes
+    keys: np.ndarray
+    total: int
+    # Version du store reflétée par la liste
+    version: int
+
+
+class ProfileMatches:
+    def __init__(self, depth: int, poll: float) -> None:
+        self.depth = depth
+        self.poll = poll
+        # Listes par request_key, et clé de chaque utilisateur
+        self._lists: Dict[str, MatchList] = {}
+        self._users: Dict[str, str] = {}
+        # Travail en attente pour le thread de fond
+        self._rows: Set[int] = set()
+        self._reset = False
+        self._dirty: Set[str] = set()
+        self._version = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.depth > 0
+
+    def start(self) -> None:
+        """Branche les listeners et lance le calcul initial pour tous les profils."""
+        if not self.enabled or self._thread is not None:
+            return
+        store.add_listener(self._on_jobs)
+        profile_store.add_listener(self._on_profile)
+        with self._cond:
+            self._version = max(self._version, store.version)
+        self._thread = threading.Thread(target=self._run, name="profile-matches", daemon=True)
+        self._thread.start()
+
+    def lookup(self, user_id: str, key: str, version: int) -> Optional[Ranking]:
+        """Début de classement précalculé, None s'il manque ou n'est plus à jour."""
+        with self._cond:
+            match = self._lists.get(key) if self._users.get(user_id) == key else None
+            if match is None and self.enabled and user_id not in self._dirty:
+                # Profil inconnu ou modifié par un autre processus : à (re)calculer
+                self._dirty.add(user_id)
+                self._cond.notify()
+        if match is None or match.version != version:
+            return None
+        rows, scores = decode_keys(match.keys)
+        return Ranking(match.keys, rows, scores, np.zeros(len(rows)), total=match.total, remaining=match.total)
+
+    def _on_jobs(self, version: int, rows: Optional[Set[int]]) -> None:
+        with self._cond:
+            self._version = version
+            if rows is None:
+                self._reset = True
+                self._rows.clear()
+            elif not self._reset:
+                self._rows.update(rows)
+            self._cond.notify()
+
+    def _on_profile(self, user_id: str) -> None:
+        with self._cond:
+            self._dirty.add(user_id)
+            self._cond.notify()
+
+    def _run(self) -> None:
+        user_ids = {p.user_id for p in profile_store.iter_profiles()}
+        with self._cond:
+            self._dirty.update(user_ids)
+        while True:
+            with self._cond:
+                if not (self._rows or self._reset or self._dirty):
+                    self._cond.wait(self.poll)
+                rows, reset, dirty, version = self._rows, self._reset, self._dirty, self._version
+                self._rows, self._reset, self._dirty = set(), False, set()
+            if not (rows or reset or dirty):
+                # Écritures d'autres processus (scraping hebdo) : déclenchent _on_jobs
+                store.refresh()
+                continue
+            try:
+                self._update(rows, reset, dirty, version)
+            except Exception as e:
+                print(f"[ProfileMatches] Update failed: {e}")
+
+    def _full(self, req: SearchRequest, cv_score: float, version: int) -> MatchList:
+        ranking = pipeline._rank(req, self.depth, cv_score)
+        return MatchList(req, cv_score, ranking.keys, ranking.total, version)
+
+    def _update(self, rows: Set[int], reset: bool, dirty: Set[str], version: int) -> None:
+        with self._cond:
+            lists = dict(self._lists)
+            users = dict(self._users)
+        if reset:
+            dirty |= set(users)
+            lists.clear()
+
+        # Offres touchées : rescoring des seuls rangs concernés, liste par liste
+        if rows and lists:
+            changed = np.fromiter(rows, dtype=np.int64, count=len(rows))
+            changed.sort()
+            # Sans filtre dur, les candidats sont tous les représentants de cluster
+            eligible = store.collapse_duplicates(store.columns.rows())
+            total = len(eligible)
+            fresh = changed[np.isin(changed, eligible, assume_unique=True)]
+            for key, match in lists.items():
+                if semantic_query(match.req) is not None:
+                    # Candidats issus de l'index ANN : pas de fusion incrémentale
+                    lists[key] = self._full(match.req, match.cv_score, version)
+                else:
+                    lists[key] = self._merge(match, changed, fresh, total, version)
+
+        # Profils créés / modifiés / supprimés
+        for user_id in dirty:
+            cached = profile_store.get_cached(user_id)
+            if cached is None:
+                users.pop(user_id, None)
+                continue
+            req = apply_profile(SearchRequest(), cached)
+            cv_score = cv_keyword_score(req)
+            key = request_key(req, cv_score)
+            users[user_id] = key
+            if key not in lists:
+                lists[key] = self._full(req, cv_score, version)
+
+        used = set(users.values())
+        with self._cond:
+            self._lists = {key: match for key, match in lists.items() if key in used}
+            self._users = users
+
+    def _merge(self, match: MatchList, changed: np.ndarray, fresh: np.ndarray, total: int, version: int) -> MatchList:
+        """Fusionne les rangs rescorés dans la liste ; recalcul complet si elle devient trop courte."""
+        old_rows, _ = decode_keys(match.keys)
+        kept = match.keys[~np.isin(old_rows, changed)]
+        scored = score_rows(store.columns, fresh, match.req, None, match.cv_score)
+        keys = np.concatenate([kept, scored.keys])
+        if len(match.keys) < match.total and len(match.keys):
+            # Liste tronquée : au-delà de son ancienne borne, des offres non
+            # touchées (absentes de la liste) peuvent devancer les nouvelles
+            keys = keys[keys <= match.keys[-1]]
+        keys = keys[top_k(keys, self.depth)]
+        if len(keys) < min(self.depth, total):
+            return self._full(match.req, match.cv_score, version)
+        return MatchList(match.req, match.cv_score, keys, total, version)
+
+
+profile_matches = ProfileMatches(settings.profile_matches_depth, settings.profile_matches_poll)
@@ -0,0 +1,128 @@
+"""
+Cache des classements /search (LRU + TTL, single-flight).
+
+Clé : hash canonique des champs de SearchRequest qui influent sur le score
+et les candidats (mots-clés en minuscules triés, pays/contrats/sources
+normalisés, score CV déjà calculé au lieu du texte du CV...) + version du
+store. Toute écriture dans le store change la version : les entrées
+précédentes ne sont plus jamais lues et le cache est vidé.
+
+Des requêtes identiques simultanées ne calculent le classement qu'une fois :
+les suivantes attendent le résultat du premier calcul (single-flight).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from ..models import SearchRequest
+from ..utils.embeddings import semantic_query
+
+
+def _norm_list(values) -> list:
+    return sorted({v.lower() for v in values})
+
+
+def request_key(req: SearchRequest, cv_score: float) -> str:
+    """Hash canonique de la requête, limité aux champs qui changent le classement.
+
+    Les mots-clés gardent leur multiplicité (keyword_score divise par leur
+    nombre) ; remote_preference est comparé tel quel par constraint_penalty.
+    """
+    canonical = {
+        "keywords": sorted(kw.lower() for kw in req.keywords),
+        "countries": _norm_list(req.countries),
+        "contract_types": _norm_list(req.contract_types),
+        "remote_preference": req.remote_preference or None,
+        "salary_min": req.salary_min or None,
+        "sources": _norm_list(req.sources),
+        "strict_filters": req.strict_filters,
+        "ranking": req.ranking,
+        "cv_score": cv_score,
+        # Recherche sémantique : candidats dépendant du texte complet (CV compris)
+        "semantic": semantic_query(req),
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._version: Any = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get_or_compute(self, key: Hashable, version: Any, compute: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return compute()
+        with self._lock:
+            if version != self._version:
+                # Corpus modifié : toutes les entrées sont périmées
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            flight = (version, key)
+            future = self._inflight.get(flight)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                self.misses += 1
+                future = self._inflight[flight] = Future()
+                owner = True
+        if not owner:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(flight, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._inflight.pop(flight, None)
+            if version == self._version:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,69 @@
+"""
+Colonnes NumPy des offres (une ligne par rang d'insertion du store).
+
+Catégories encodées en entiers (0 = valeur absente/vide) avec la même
+normalisation que constraint_penalty : pays et contrat en minuscules, remote
+tel quel. Salaire en float, NaN si absent ou nul. `canonical` : rang du
+représentant du cluster de quasi-doublons (le rang lui-même par défaut).
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..models import JobPosting
+
+CATEGORICAL = {
+    "country": lambda v: v.lower(),
+    "contract_type": lambda v: v.lower(),
+    "remote_type": lambda v: v,
+}
+
+
+class JobColumns:
+    def __init__(self, capacity: int = 1024) -> None:
+        self.size = 0
+        self.codes: Dict[str, np.ndarray] = {f: np.zeros(capacity, dtype=np.int32) for f in CATEGORICAL}
+        self.vocab: Dict[str, Dict[str, int]] = {f: {} for f in CATEGORICAL}
+        self.salary_min = np.full(capacity, np.nan)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.canonical = np.arange(capacity, dtype=np.int64)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.alive)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        for field, arr in self.codes.items():
+            self.codes[field] = np.concatenate([arr, np.zeros(new_capacity - capacity, dtype=np.int32)])
+        self.salary_min = np.concatenate([self.salary_min, np.full(new_capacity - capacity, np.nan)])
+        self.alive = np.concatenate([self.alive, np.zeros(new_capacity - capacity, dtype=bool)])
+        self.canonical = np.concatenate([self.canonical, np.arange(capacity, new_capacity, dtype=np.int64)])
+
+    def code(self, field: str, value: Optional[str]) -> Optional[int]:
+        """Code d'une valeur de requête (None si jamais vue dans le corpus)."""
+        return self.vocab[field].get(CATEGORICAL[field](value))
+
+    def set(self, row: int, job: JobPosting) -> None:
+        self._grow(row + 1)
+        for field, norm in CATEGORICAL.items():
+            value = getattr(job, field)
+            if value:
+                vocab = self.vocab[field]
+                key = norm(value)
+                code = vocab.get(key)
+                if code is None:
+                    code = vocab[key] = len(vocab) + 1
+                self.codes[field][row] = code
+            else:
+                self.codes[field][row] = 0
+        self.salary_min[row] = job.salary_min if job.salary_min else np.nan
+        self.alive[row] = True
+        self.size = max(self.size, row + 1)
+
+    def unset(self, row: int) -> None:
+        self.alive[row] = False
+
+    def rows(self) -> np.ndarray:
+        return np.flatnonzero(self.alive[: self.size])
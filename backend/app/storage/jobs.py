@@ -0,0 +1,22 @@
+"""
+Sélection du store d'offres selon `settings.database_url`.
+
+- `memory://...`  : MemoryStore (perdu au redémarrage)
+- `sqlite:///chemin/relatif.db` ou `sqlite:////chemin/absolu.db` : SQLiteStore
+"""
+from __future__ import annotations
+
+from ..config import settings
+from .memory import MemoryStore
+from .sqlite_store import SQLiteStore
+
+
+def create_store(url: str) -> MemoryStore:
+    if url.startswith("memory://"):
+        return MemoryStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported DATABASE_URL: {url}")
+
+
+store = create_store(settings.database_url)
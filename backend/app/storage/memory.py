@@ -1,25 +1,337 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import math
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set
 
-from ..models import JobPosting
+import numpy as np
+
+from ..config import settings
+from ..models import JobPosting, SearchRequest
+from ..utils.bm25 import bm25f_scores
+from ..utils.dedupe import content_fingerprint
+from ..utils.embeddings import embed_job, embed_query
+from ..utils.near_dup import NearDuplicateIndex
+from .columns import JobColumns
+from .text_index import InvertedIndex
+from .vector_index import IVFIndex
+
+# Champs indexés -> normalisation de la valeur (alignée sur constraint_penalty)
+INDEXED_FIELDS = {
+    "country": lambda v: v.lower(),
+    "contract_type": lambda v: v.lower(),
+    "remote_type": lambda v: v,
+    "source": lambda v: v.lower(),
+}
+
+
+@dataclass
+class JobDiff:
+    """Tri d'un lot d'offres par rapport au store (cf. MemoryStore.merge_jobs)."""
+    new: List[JobPosting] = field(default_factory=list)
+    changed: List[JobPosting] = field(default_factory=list)
+    unchanged: List[JobPosting] = field(default_factory=list)
+
+    @property
+    def written(self) -> List[JobPosting]:
+        return self.new + self.changed
 
 
 class MemoryStore:
-    def __init__(self) -> None:
-        self._jobs: Dict[str, JobPosting] = {}
+    """Store en mémoire avec index secondaires.
 
-    def upsert_jobs(self, jobs: List[JobPosting]) -> int:
-        for job in jobs:
-            self._jobs[job.id] = job
-        return len(jobs)
+    Chaque champ de INDEXED_FIELDS a un index valeur -> ids ; les offres sans
+    valeur sont sous la clé None. `salary_min` est indexé par une liste triée
+    reconstruite à la demande. L'ordre d'insertion est conservé (rang par id).
+    Un index inversé (titre, description, skills) sert au scoring mots-clés
+    et des colonnes NumPy par rang (JobColumns) au scoring vectorisé.
+    Chaque offre garde son empreinte de contenu et sa date de dernière vue
+    (scraping incrémental). Les quasi-doublons inter-sources sont regroupés
+    en clusters (NearDuplicateIndex) si `near_duplicates` est actif, et
+    leurs embeddings indexés pour la recherche sémantique (IVFIndex) si
+    `semantic` est actif.
+    """
 
-    def search(self) -> List[JobPosting]:
-        return list(self._jobs.values())
+    def __init__(self, near_duplicates: Optional[bool] = None, semantic: Optional[bool] = None) -> None:
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[int, Optional[Set[int]]], None]] = []
+        self.near_duplicates = settings.near_duplicates if near_duplicates is None else near_duplicates
+        self.semantic = settings.semantic_search if semantic is None else semantic
+        self.clear()
 
     def clear(self) -> None:
-        self._jobs = {}
+        with self._lock:
+            self._jobs: Dict[str, JobPosting] = {}
+            self._rows: Dict[str, int] = {}
+            self._row_ids: List[str] = []
+            self._text_index = InvertedIndex()
+            self.columns = JobColumns()
+            self._near_dups = NearDuplicateIndex() if self.near_duplicates else None
+            self._vectors = IVFIndex() if self.semantic else None
+            self._index: Dict[str, Dict[Optional[str], Set[str]]] = {f: {} for f in INDEXED_FIELDS}
+            self._salary: Dict[str, float] = {}
+            self._no_salary: Set[str] = set()
+            self._salary_sorted: Optional[tuple[list, list]] = None
+            self._fingerprints: Dict[str, str] = {}
+            self._last_seen: Dict[str, float] = {}
+            self.version = 0
+            # Rangs réattribués : tout ce qui dépendait des rangs est à recalculer
+            for listener in self._listeners:
+                listener(self.version, None)
+
+    def add_listener(self, listener: Callable[[int, Optional[Set[int]]], None]) -> None:
+        """Appelé (sous le verrou du store, doit rester bref) après chaque écriture.
+
+        Arguments : nouvelle version et rangs touchés (offres écrites et offres
+        dont le représentant de quasi-doublons a changé), None après clear().
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _index_add(self, job: JobPosting) -> None:
+        for name, norm in INDEXED_FIELDS.items():
+            value = getattr(job, name)
+            key = norm(value) if value else None
+            self._index[name].setdefault(key, set()).add(job.id)
+        if job.salary_min:
+            self._salary[job.id] = job.salary_min
+        else:
+            self._no_salary.add(job.id)
+
+    def _index_remove(self, job: JobPosting) -> None:
+        for name, norm in INDEXED_FIELDS.items():
+            value = getattr(job, name)
+            key = norm(value) if value else None
+            bucket = self._index[name].get(key)
+            if bucket is not None:
+                bucket.discard(job.id)
+                if not bucket:
+                    del self._index[name][key]
+        self._salary.pop(job.id, None)
+        self._no_salary.discard(job.id)
+
+    def upsert_jobs(self, jobs: List[JobPosting], vectors: Optional[np.ndarray] = None) -> int:
+        """Ajoute ou remplace des offres ; `vectors` : embeddings déjà calculés (même ordre)."""
+        with self._lock:
+            now = time.time()
+            touched: Set[int] = set()
+            for i, job in enumerate(jobs):
+                previous = self._jobs.get(job.id)
+                if previous is not None:
+                    row = self._rows[job.id]
+                    self._index_remove(previous)
+                    self._text_index.remove(row, previous)
+                    if self._near_dups is not None:
+                        touched.update(self._set_canonical(self._near_dups.remove(row)))
+                else:
+                    row = self._rows[job.id] = len(self._row_ids)
+                    self._row_ids.append(job.id)
+                self._jobs[job.id] = job
+                self._index_add(job)
+                self._text_index.add(row, job)
+                self.columns.set(row, job)
+                if self._vectors is not None:
+                    self._vectors.set(row, vectors[i] if vectors is not None else embed_job(job))
+                if self._near_dups is not None:
+                    touched.update(self._set_canonical(self._near_dups.add(row, job)))
+                touched.add(row)
+                self._fingerprints[job.id] = content_fingerprint(job)
+                self._last_seen[job.id] = now
+            if jobs:
+                self._salary_sorted = None
+                self.version += 1
+                for listener in self._listeners:
+                    listener(self.version, touched)
+        return len(jobs)
+
+    def _set_canonical(self, changes: Dict[int, int]) -> Dict[int, int]:
+        canonical = self.columns.canonical
+        for row, rep in changes.items():
+            canonical[row] = rep
+        return changes
+
+    def merge_jobs(self, jobs: List[JobPosting]) -> JobDiff:
+        """Upsert incrémental : seules les offres nouvelles ou modifiées sont écrites.
+
+        Les offres inchangées (même empreinte) sont seulement marquées vues.
+        """
+        diff = JobDiff()
+        with self._lock:
+            for job in jobs:
+                known = self._fingerprints.get(job.id)
+                if known is None:
+                    diff.new.append(job)
+                elif known != content_fingerprint(job):
+                    diff.changed.append(job)
+                else:
+                    diff.unchanged.append(job)
+            self.touch(job.id for job in diff.unchanged)
+            self.upsert_jobs(diff.written)
+        return diff
+
+    def touch(self, job_ids: Iterable[str]) -> None:
+        """Marque des offres comme vues maintenant (sans les réécrire)."""
+        with self._lock:
+            now = time.time()
+            for job_id in job_ids:
+                self._last_seen[job_id] = now
+
+    def count_unseen_since(self, since: float) -> int:
+        """Offres non revues depuis `since` (timestamp) : expirées pour un scraping complet."""
+        with self._lock:
+            return sum(1 for seen in self._last_seen.values() if seen < since)
+
+    def refresh(self) -> None:
+        """Prend en compte les écritures externes (rien à faire en mémoire)."""
+
+    def get(self, job_id: str) -> Optional[JobPosting]:
+        return self._jobs.get(job_id)
+
+    def row(self, job_id: str) -> int:
+        """Rang d'insertion (stable, ne change pas à la mise à jour)."""
+        return self._rows[job_id]
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _match(self, name: str, values: List[str]) -> Set[str]:
+        """Ids dont le champ vaut l'une des valeurs, ou est inconnu."""
+        norm = INDEXED_FIELDS[name]
+        index = self._index[name]
+        ids = set(index.get(None, ()))
+        for value in values:
+            ids.update(index.get(norm(value), ()))
+        return ids
+
+    def _salary_at_least(self, minimum: float) -> Set[str]:
+        if self._salary_sorted is None:
+            pairs = sorted((salary, job_id) for job_id, salary in self._salary.items())
+            self._salary_sorted = ([p[0] for p in pairs], [p[1] for p in pairs])
+        salaries, ids = self._salary_sorted
+        return self._no_salary | set(ids[bisect_left(salaries, minimum):])
+
+    def candidate_ids(self, req: SearchRequest) -> Optional[Set[str]]:
+        """Ids restants après filtres durs, None si aucun filtre ne s'applique.
+
+        En mode `strict_filters`, on écarte exactement les offres que
+        constraint_penalty pénaliserait ; `sources` filtre toujours.
+        """
+        filters: List[Set[str]] = []
+        if req.sources:
+            filters.append(self._match("source", req.sources) - self._index["source"].get(None, set()))
+        if req.strict_filters:
+            if req.countries:
+                filters.append(self._match("country", req.countries))
+            if req.contract_types:
+                filters.append(self._match("contract_type", req.contract_types))
+            if req.remote_preference:
+                filters.append(self._match("remote_type", [req.remote_preference]))
+        salary_min = req.salary_min if req.strict_filters else None
+        if not filters:
+            return self._salary_at_least(salary_min) if salary_min else None
+        filters.sort(key=len)
+        ids = filters[0]
+        for other in filters[1:]:
+            ids = ids & other
+        if salary_min:
+            # Plus rapide en prédicat sur les candidats restants qu'en ensemble
+            salary = self._salary
+            ids = {i for i in ids if salary.get(i, salary_min) >= salary_min}
+        return ids
+
+    def job_id(self, row: int) -> str:
+        return self._row_ids[row]
+
+    def candidate_rows(self, req: SearchRequest) -> np.ndarray:
+        """Rangs candidats (triés) après filtres durs, pour le scoring vectorisé."""
+        with self._lock:
+            ids = self.candidate_ids(req)
+            if ids is None:
+                return self.columns.rows()
+            rows = self._rows
+            out = np.fromiter((rows[i] for i in ids), dtype=np.int64, count=len(ids))
+            out.sort()
+            return out
+
+    def collapse_duplicates(self, rows: np.ndarray) -> np.ndarray:
+        """Une offre par cluster de quasi-doublons parmi `rows` (triés) : la plus ancienne.
+
+        Le canonique est gardé s'il est parmi les candidats, sinon le plus
+        ancien des membres présents (ex. filtre `sources` qui l'exclut).
+        """
+        if self._near_dups is None or not len(rows):
+            return rows
+        canonical = self.columns.canonical[rows]
+        _, first = np.unique(canonical, return_index=True)
+        first.sort()
+        return rows[first]
+
+    def duplicates_of(self, job_id: str) -> List[str]:
+        """Ids des autres offres du cluster de quasi-doublons de `job_id`."""
+        if self._near_dups is None:
+            return []
+        with self._lock:
+            row = self._rows[job_id]
+            return [self._row_ids[r] for r in sorted(self._near_dups.cluster(row)) if r != row]
+
+    def _keyword_hit_rows(self, keywords: List[str]) -> Dict[int, int]:
+        def text_of(row: int) -> str:
+            job = self._jobs[self._row_ids[row]]
+            return f"{job.title} {job.description or ''}".lower()
+
+        return self._text_index.keyword_hits(keywords, text_of, lambda: self._rows.values())
+
+    def keyword_hits(self, keywords: List[str]) -> Dict[str, int]:
+        """Nombre de mots-clés trouvés dans titre + description, par id (offres avec au moins 1 hit)."""
+        if not keywords:
+            return {}
+        with self._lock:
+            hits = self._keyword_hit_rows(keywords)
+            row_ids = self._row_ids
+            return {row_ids[row]: count for row, count in hits.items()}
+
+    def keyword_vector(self, keywords: List[str]) -> Optional[np.ndarray]:
+        """Part des mots-clés trouvés par rang (comme keyword_score), None sans mots-clés."""
+        if not keywords:
+            return None
+        with self._lock:
+            hits = self._keyword_hit_rows(keywords)
+            kw = np.zeros(len(self._row_ids))
+        if hits:
+            rows = np.fromiter(hits.keys(), dtype=np.int64, count=len(hits))
+            counts = np.fromiter(hits.values(), dtype=np.int64, count=len(hits))
+            kw[rows] = counts / len(keywords)
+        return kw
+
+    def bm25_vector(self, keywords: List[str]) -> Optional[np.ndarray]:
+        """Score BM25F normalisé par rang (cf. utils/bm25), None sans terme de requête."""
+        with self._lock:
+            return bm25f_scores(self._text_index, len(self._row_ids), keywords)
+
+    def term_idf(self, term: str) -> float:
+        """IDF (formule BM25) d'un terme, fréquence documentaire prise sur le champ où il est le plus courant."""
+        df = self._text_index.doc_freq(term)
+        return math.log(1.0 + (len(self._row_ids) - df + 0.5) / (df + 0.5))
 
+    def semantic_rows(self, text: str, k: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rangs des k offres les plus proches de `text` (index ANN), parmi `rows` (triés) si fourni."""
+        if self._vectors is None:
+            return np.empty(0, dtype=np.int64)
+        with self._lock:
+            query = embed_query(text, self.term_idf)
+            if query is None:
+                return np.empty(0, dtype=np.int64)
+            return self._vectors.search(query, k, settings.semantic_nprobe, rows)
 
-store = MemoryStore()
+    def search(self, req: Optional[SearchRequest] = None) -> List[JobPosting]:
+        """Offres candidates (ordre d'insertion), réduites par les filtres durs de `req`."""
+        with self._lock:
+            ids = self.candidate_ids(req) if req is not None else None
+            if ids is None:
+                return list(self._jobs.values())
+            rows = self._rows
+            return [self._jobs[i] for i in sorted(ids, key=rows.__getitem__)]
 
@@ -0,0 +1,155 @@
+"""
+Profils utilisateur sur SQLite (une ligne par utilisateur).
+
+- Le profil est stocké en JSON compact (`model_dump_json`, relu par
+  `model_validate_json`, tous deux en Rust côté Pydantic).
+- Chaque écriture est une seule instruction (INSERT / UPSERT / DELETE) en
+  autocommit : atomique, pas de profil tronqué après un crash (WAL).
+- Les profils lus restent en cache avec leurs ProfileInputs. Au plus toutes
+  les `profile_cache_recheck` secondes, `PRAGMA data_version` indique si un
+  autre processus a écrit ; le cache est alors vidé. Une lecture de profil
+  en cache ne fait donc en général aucune I/O.
+- `get_many` : une requête `IN (...)` par lot pour les profils absents du cache.
+"""
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from ..models.profile import UserProfile
+from .profile_store import BaseProfileStore, CachedProfile
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    seq INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+"""
+
+# Paramètres max par requête IN (...)
+FETCH_BATCH = 500
+
+
+class SQLiteProfileStore(BaseProfileStore):
+    def __init__(self, path: str, recheck: Optional[float] = None) -> None:
+        # Le verrou hérité protège aussi la connexion, partagée entre threads
+        super().__init__(recheck)
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._data_version: Optional[int] = None
+        self._checked_at = float("-inf")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def _sync(self) -> None:
+        """Vide le cache si un autre processus a écrit depuis le dernier contrôle."""
+        now = time.monotonic()
+        if now - self._checked_at < self.recheck:
+            return
+        self._checked_at = now
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._cache.clear()
+            self._data_version = data_version
+
+    def _decode(self, data: str) -> CachedProfile:
+        return self._remember(UserProfile.model_validate_json(data), (0, len(data)))
+
+    def get_cached(self, user_id: str) -> CachedProfile | None:
+        with self._lock:
+            self._sync()
+            cached = self._cache.get(user_id)
+            if cached is not None:
+                return cached
+            row = self._conn.execute("SELECT data FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+            return self._decode(row[0]) if row else None
+
+    def get_many(self, user_ids: Iterable[str]) -> Dict[str, UserProfile]:
+        profiles: Dict[str, UserProfile] = {}
+        missing = []
+        with self._lock:
+            self._sync()
+            for user_id in dict.fromkeys(user_ids):
+                cached = self._cache.get(user_id)
+                if cached is not None:
+                    profiles[user_id] = cached.profile
+                else:
+                    missing.append(user_id)
+            for i in range(0, len(missing), FETCH_BATCH):
+                batch = missing[i:i + FETCH_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT user_id, data FROM profiles WHERE user_id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+                for user_id, data in rows:
+                    profiles[user_id] = self._decode(data).profile
+        return profiles
+
+    def iter_profiles(self) -> Iterator[UserProfile]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM profiles ORDER BY user_id").fetchall()
+        for (data,) in rows:
+            yield UserProfile.model_validate_json(data)
+
+    def _insert(self, profile: UserProfile) -> bool:
+        data = profile.model_dump_json()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO profiles (user_id, data) VALUES (?, ?) ON CONFLICT(user_id) DO NOTHING",
+                (profile.user_id, data),
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._remember(profile, (0, len(data)))
+        return True
+
+    def _save(self, profile: UserProfile) -> None:
+        data = profile.model_dump_json()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO profiles (user_id, data) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data",
+                (profile.user_id, data),
+            )
+            self._remember(profile, (0, len(data)))
+
+    def delete(self, user_id: str) -> bool:
+        with self._lock:
+            self._cache.pop(user_id, None)
+            cursor = self._conn.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
+        if cursor.rowcount == 0:
+            return False
+        self._notify(user_id)
+        return True
+
+    def import_profiles(self, profiles: Iterable[UserProfile]) -> int:
+        """Insère des profils en une transaction (les user_id déjà présents sont ignorés)."""
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT INTO profiles (user_id, data) VALUES (?, ?) ON CONFLICT(user_id) DO NOTHING",
+                    ((p.user_id, p.model_dump_json()) for p in profiles),
+                )
+                imported = conn.total_changes - before
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,33 +1,103 @@
 """
-Stockage des profils utilisateur (MVP: fichiers JSON).
+Stockage des profils utilisateur.
+
+- BaseProfileStore (classe abstraite) : ce qui est commun aux backends,
+  cache des profils et de leurs ProfileInputs, listeners, create / update /
+  get. Chaque backend implémente la lecture (`get_cached`, `iter_profiles`)
+  et l'écriture (`_insert`, `_save`, `delete`).
+- ProfileStore : un fichier JSON par utilisateur, écritures atomiques et
+  différées (write-behind).
+- SQLiteProfileStore (profile_sqlite.py) : une ligne par utilisateur, backend
+  par défaut.
+
+Le backend est choisi via `settings.profile_store_url` (cf. profiles.py).
 """
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
+from ..config import settings
 from ..models.profile import ProfileCreate, ProfileUpdate, UserProfile
 
+# Stores JSON vivants, flushés à la sortie du processus (un seul hook atexit)
+_json_stores: "weakref.WeakSet[ProfileStore]" = weakref.WeakSet()
 
-class ProfileStore:
-    """Stockage des profils en fichiers JSON."""
-    
-    def __init__(self, data_dir: str = "data/profiles"):
-        self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-    
-    def _get_file_path(self, user_id: str) -> Path:
-        """Chemin du fichier pour un user_id."""
-        # Sanitize user_id pour nom de fichier
-        safe_id = user_id.replace("@", "_").replace("/", "_").replace("\\", "_")
-        return self.data_dir / f"{safe_id}.json"
-    
-    def create(self, profile_data: ProfileCreate) -> UserProfile:
-        """Créer un nouveau profil."""
+
+@atexit.register
+def _flush_all() -> None:
+    for store in list(_json_stores):
+        store.flush()
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        return True  # pas de test fiable : on garde le fichier
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # EPERM : processus d'un autre utilisateur, vivant
+    return True
+
+
+@dataclass(frozen=True)
+class ProfileInputs:
+    """Entrées de scoring dérivées d'un profil, calculées une fois par version du fichier."""
+    cv_summary: str
+    skills: FrozenSet[str]
+    contract_types: Tuple[str, ...]
+    remote: Optional[str]
+    countries: Tuple[str, ...]
+    salary_min: Optional[int]
+
+    @classmethod
+    def from_profile(cls, profile: UserProfile) -> "ProfileInputs":
+        return cls(
+            cv_summary=profile.to_cv_summary(),
+            skills=frozenset(s.strip().lower() for s in profile.skills if s.strip()),
+            contract_types=tuple(c.lower() for c in profile.preferred_contract_types),
+            remote=profile.preferred_remote,
+            countries=tuple(c.lower() for c in profile.preferred_countries),
+            salary_min=profile.salary_min,
+        )
+
+
+@dataclass
+class CachedProfile:
+    profile: UserProfile
+    inputs: ProfileInputs
+    # (mtime_ns, taille) du fichier lu, et dernier contrôle (horloge monotone)
+    stamp: Tuple[int, int]
+    checked_at: float
+
+
+class BaseProfileStore(ABC):
+    """Partie commune des stores de profils : cache, listeners, create / update.
+
+    Les sous-classes fournissent la lecture (`get_cached`, `iter_profiles`)
+    et l'écriture (`_insert`, `_save`, `delete`, `flush`).
+    """
+
+    def __init__(self, recheck: Optional[float] = None) -> None:
+        self.recheck = settings.profile_cache_recheck if recheck is None else recheck
+        self._cache: Dict[str, CachedProfile] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[str], None]] = []
+
+    def create(self, profile_data: ProfileCreate, parsed: dict[str, Any] | None = None) -> UserProfile | None:
+        """Créer un nouveau profil (avec les données extraites du CV) ; None s'il existe déjà."""
         profile = UserProfile(
             id=str(uuid4()),
             user_id=profile_data.user_id,
@@ -42,35 +112,40 @@ class ProfileStore:
             salary_min=profile_data.salary_min,
             preferred_countries=profile_data.preferred_countries,
             preferred_categories=profile_data.preferred_categories,
+            **(parsed or {}),
         )
         
-        self._save(profile)
+        if not self._insert(profile):
+            return None
+        self._notify(profile.user_id)
         return profile
     
     def get(self, user_id: str) -> UserProfile | None:
-        """Récupérer un profil par user_id."""
-        file_path = self._get_file_path(user_id)
-        if not file_path.exists():
-            return None
-        
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # Convertir les dates string en datetime
-                if "created_at" in data:
-                    data["created_at"] = datetime.fromisoformat(data["created_at"])
-                if "updated_at" in data:
-                    data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-                return UserProfile(**data)
-        except Exception as e:
-            print(f"[ProfileStore] Error loading profile {user_id}: {e}")
-            return None
+        """Récupérer un profil par user_id (ne pas modifier l'objet renvoyé : il est en cache)."""
+        cached = self.get_cached(user_id)
+        return cached.profile if cached else None
+    
+    def get_inputs(self, user_id: str) -> ProfileInputs | None:
+        """Entrées de scoring précalculées du profil (résumé CV, skills, préférences)."""
+        cached = self.get_cached(user_id)
+        return cached.inputs if cached else None
+    
+    def get_many(self, user_ids: Iterable[str]) -> Dict[str, UserProfile]:
+        """Profils existants parmi `user_ids` (user_id -> profil)."""
+        profiles = {}
+        for user_id in user_ids:
+            profile = self.get(user_id)
+            if profile is not None:
+                profiles[user_id] = profile
+        return profiles
     
     def update(self, user_id: str, update_data: ProfileUpdate) -> UserProfile | None:
         """Mettre à jour un profil."""
         profile = self.get(user_id)
         if not profile:
             return None
+        # Copie : l'instance en cache reste intacte si l'écriture échoue
+        profile = profile.model_copy(deep=True)
         
         # Mettre à jour les champs fournis
         update_dict = update_data.model_dump(exclude_unset=True)
@@ -80,36 +155,260 @@ class ProfileStore:
         
         profile.updated_at = datetime.now()
         self._save(profile)
+        self._notify(user_id)
         return profile
     
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Appelé avec le user_id après chaque création, mise à jour ou suppression."""
+        self._listeners.append(listener)
+    
+    def _notify(self, user_id: str) -> None:
+        for listener in self._listeners:
+            listener(user_id)
+    
+    def _remember(self, profile: UserProfile, stamp: Tuple[int, int]) -> CachedProfile:
+        cached = CachedProfile(profile, ProfileInputs.from_profile(profile), stamp, time.monotonic())
+        with self._lock:
+            self._cache[profile.user_id] = cached
+        return cached
+    
+    @abstractmethod
+    def get_cached(self, user_id: str) -> CachedProfile | None:
+        """Profil en cache (relu si nécessaire) avec ses ProfileInputs ; None s'il n'existe pas."""
+    
+    @abstractmethod
+    def iter_profiles(self) -> Iterator[UserProfile]:
+        """Tous les profils stockés."""
+    
+    @abstractmethod
+    def delete(self, user_id: str) -> bool:
+        """Supprimer un profil ; False s'il n'existe pas."""
+    
+    def flush(self) -> None:
+        """Écrit les profils en attente (sans effet si les écritures sont immédiates)."""
+    
+    @abstractmethod
+    def _insert(self, profile: UserProfile) -> bool:
+        """Écrire un nouveau profil ; False s'il existe déjà."""
+    
+    @abstractmethod
+    def _save(self, profile: UserProfile) -> None:
+        """Écrire la nouvelle version d'un profil existant."""
+
+
+class ProfileStore(BaseProfileStore):
+    """Stockage des profils en fichiers JSON.
+
+    Les profils lus sont gardés en mémoire avec leurs entrées de scoring
+    dérivées (ProfileInputs). Le fichier n'est relu que si son mtime/taille
+    change ; ce contrôle (un stat) est fait au plus toutes les
+    `profile_cache_recheck` secondes par profil, une recherche authentifiée
+    ne fait donc en général aucune I/O. Les écritures de ce processus mettent
+    le cache à jour directement.
+
+    Écritures atomiques : fichier temporaire + fsync puis rename, un crash ne
+    laisse jamais de profil tronqué. Elles sont différées de `write_delay`
+    secondes (write-behind) : les mises à jour successives d'un même profil
+    dans cette fenêtre ne donnent qu'une écriture, et tout le lot partage un
+    fsync du répertoire. 0 = écriture synchrone. Les créations restent
+    synchrones : le link exclusif doit échouer tout de suite si un autre
+    processus a créé le même profil.
+    """
+    
+    def __init__(
+        self,
+        data_dir: str = "data/profiles",
+        recheck: Optional[float] = None,
+        write_delay: Optional[float] = None,
+    ):
+        super().__init__(recheck)
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.write_delay = settings.profile_write_delay if write_delay is None else write_delay
+        # Write-behind : dernière version non écrite de chaque profil modifié
+        self._pending: Dict[str, UserProfile] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        # Fichiers temporaires laissés par un crash pendant une écriture
+        # (<profil>.json.<pid>-<thread>.tmp) : ceux d'un worker vivant sont en cours d'écriture
+        for tmp_path in self.data_dir.glob("*.tmp"):
+            pid = tmp_path.name.rsplit(".", 2)[-2].split("-")[0]
+            if not pid.isdigit() or not _pid_alive(int(pid)):
+                tmp_path.unlink(missing_ok=True)
+        _json_stores.add(self)
+    
+    def _get_file_path(self, user_id: str) -> Path:
+        """Chemin du fichier pour un user_id."""
+        # Sanitize user_id pour nom de fichier
+        safe_id = user_id.replace("@", "_").replace("/", "_").replace("\\", "_")
+        return self.data_dir / f"{safe_id}.json"
+    
+    def iter_profiles(self) -> Iterator[UserProfile]:
+        """Tous les profils stockés (lus depuis le disque, sans passer par le cache)."""
+        self.flush()
+        for file_path in sorted(self.data_dir.glob("*.json")):
+            profile = self._load(file_path, file_path.stem)
+            if profile is not None:
+                yield profile
+    
+    def get_cached(self, user_id: str) -> CachedProfile | None:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(user_id)
+            if user_id in self._pending:
+                # Version en attente d'écriture, plus récente que le fichier
+                return cached
+        if cached is not None and now - cached.checked_at < self.recheck:
+            return cached
+        
+        file_path = self._get_file_path(user_id)
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._cache.pop(user_id, None)
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        if cached is not None and cached.stamp == stamp:
+            cached.checked_at = now
+            return cached
+        
+        profile = self._load(file_path, user_id)
+        if profile is None:
+            return None
+        return self._remember(profile, stamp)
+    
+    def _load(self, file_path: Path, user_id: str) -> UserProfile | None:
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                # Convertir les dates string en datetime
+                if "created_at" in data:
+                    data["created_at"] = datetime.fromisoformat(data["created_at"])
+                if "updated_at" in data:
+                    data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+                return UserProfile(**data)
+        except Exception as e:
+            print(f"[ProfileStore] Error loading profile {user_id}: {e}")
+            return None
+    
     def delete(self, user_id: str) -> bool:
         """Supprimer un profil."""
         file_path = self._get_file_path(user_id)
+        # Pas de flush en cours : le fichier ne peut pas réapparaître après l'unlink
+        with self._flush_lock, self._lock:
+            pending = self._pending.pop(user_id, None)
+            self._cache.pop(user_id, None)
+        deleted = pending is not None
         if file_path.exists():
             try:
                 file_path.unlink()
-                return True
+                deleted = True
             except Exception as e:
                 print(f"[ProfileStore] Error deleting profile {user_id}: {e}")
                 return False
-        return False
+        if deleted:
+            self._notify(user_id)
+        return deleted
     
-    def _save(self, profile: UserProfile) -> None:
-        """Sauvegarder un profil."""
+    def _insert(self, profile: UserProfile) -> bool:
+        """Écrire un nouveau profil ; False s'il existe déjà."""
+        try:
+            self._save(profile, exclusive=True)
+        except FileExistsError:
+            return False
+        return True
+    
+    def _save(self, profile: UserProfile, exclusive: bool = False) -> None:
+        """Sauvegarder un profil : en différé si write_delay > 0, sinon tout de suite.
+
+        `exclusive` (création) : toujours synchrone, FileExistsError si le profil existe.
+        """
+        if exclusive or self.write_delay <= 0:
+            if exclusive and profile.user_id in self._pending:
+                raise FileExistsError(profile.user_id)
+            self._write_file(profile, exclusive)
+            self._fsync_dir()
+            return
+        with self._lock:
+            # Une mise à jour encore en attente pour ce profil est remplacée (coalescing)
+            self._pending[profile.user_id] = profile
+            self._remember(profile, (0, 0))
+            self._schedule_flush()
+    
+    def _schedule_flush(self) -> None:
+        """Programme un flush dans write_delay secondes (appelé sous self._lock)."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.write_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush(self) -> None:
+        """Écrit les profils en attente, un fsync du répertoire pour tout le lot."""
+        with self._flush_lock:
+            with self._lock:
+                batch = dict(self._pending)
+                self._flush_timer = None
+            if not batch:
+                return
+            written = []
+            for profile in batch.values():
+                try:
+                    self._write_file(profile)
+                    written.append(profile)
+                except Exception as e:
+                    print(f"[ProfileStore] Flush failed for {profile.user_id}, retrying in {self.write_delay}s: {e}")
+            self._fsync_dir()
+            with self._lock:
+                for profile in written:
+                    # Profil modifié à nouveau pendant l'écriture : il reste en attente
+                    if self._pending.get(profile.user_id) is profile:
+                        del self._pending[profile.user_id]
+                # Échecs (ou profils modifiés entre-temps) : nouvel essai au prochain flush
+                if self._pending and self.write_delay > 0:
+                    self._schedule_flush()
+    
+    def _write_file(self, profile: UserProfile, exclusive: bool = False) -> Tuple[int, int]:
+        """Écriture atomique : fichier temporaire + fsync, puis rename (ou link si exclusif)."""
         file_path = self._get_file_path(profile.user_id)
+        tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
         try:
             # Convertir en dict avec dates en ISO string
             data = profile.model_dump()
             data["created_at"] = data["created_at"].isoformat()
             data["updated_at"] = data["updated_at"].isoformat()
             
-            with open(file_path, "w", encoding="utf-8") as f:
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"[ProfileStore] Error saving profile {profile.user_id}: {e}")
+                f.flush()
+                os.fsync(f.fileno())
+            if exclusive:
+                # Échoue si le profil existe déjà (création concurrente)
+                os.link(tmp_path, file_path)
+                tmp_path.unlink()
+            else:
+                os.replace(tmp_path, file_path)
+            st = file_path.stat()
+        except BaseException as e:
+            tmp_path.unlink(missing_ok=True)
+            if not isinstance(e, FileExistsError):
+                print(f"[ProfileStore] Error saving profile {profile.user_id}: {e}")
             raise
-
-
-# Instance globale
-profile_store = ProfileStore()
-
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            # Sauf si une version plus récente attend déjà d'être écrite
+            newer = self._pending.get(profile.user_id)
+            if newer is None or newer is profile:
+                self._remember(profile, stamp)
+        return stamp
+    
+    def _fsync_dir(self) -> None:
+        """Rend les renames durables (sans effet hors POSIX)."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.data_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Sélection du store de profils selon `settings.profile_store_url`.
+
+- `json://backend/data/profiles` : ProfileStore (un fichier JSON par utilisateur)
+- `sqlite:///chemin/relatif.db` ou `sqlite:////chemin/absolu.db` : SQLiteProfileStore
+
+Au premier démarrage en SQLite (base vide), les profils JSON de
+LEGACY_JSON_DIR sont importés.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from ..config import DATA_DIR, settings
+from .profile_sqlite import SQLiteProfileStore
+from .profile_store import BaseProfileStore, ProfileStore
+
+LEGACY_JSON_DIR = str(DATA_DIR / "profiles")
+
+
+def create_profile_store(url: str) -> BaseProfileStore:
+    if url.startswith("json://"):
+        return ProfileStore(url[len("json://"):])
+    if url.startswith("sqlite:///"):
+        store = SQLiteProfileStore(url[len("sqlite:///"):])
+        if len(store) == 0 and any(Path(LEGACY_JSON_DIR).glob("*.json")):
+            imported = store.import_profiles(ProfileStore(LEGACY_JSON_DIR).iter_profiles())
+            print(f"[ProfileStore] Imported {imported} profiles from {LEGACY_JSON_DIR}")
+        return store
+    raise ValueError(f"Unsupported PROFILE_STORE_URL: {url}")
+
+
+profile_store = create_profile_store(settings.profile_store_url)
@@ -0,0 +1,321 @@
+"""
+Store d'offres persistant sur SQLite (fichier partagé API / scraper hebdo).
+
+La base est la source de vérité ; chaque processus garde en mémoire les index
+de MemoryStore (filtres, colonnes NumPy, index inversé) pour servir /search.
+
+- Mode WAL : un écrivain et des lecteurs concurrents sans blocage.
+- `upsert_jobs` : un `executemany` par lot dans une transaction IMMEDIATE ;
+  chaque lot reçoit une révision croissante (`rev`).
+- Synchronisation : avant une lecture, `PRAGMA data_version` indique si un
+  autre processus a écrit ; on ne relit alors que les lignes `rev` > dernière
+  révision vue.
+- FTS5 (tokenizer trigram) sur titre, description et skills. Les mots-clés
+  composés sans espace (« ci/cd », « node.js ») y sont cherchés en sous-chaîne,
+  même sémantique que keyword_score, sans la vérification texte par candidat
+  de l'index inversé ; les mots simples restent sur l'index inversé, plus
+  rapide (cf. benchmarks/bench_keywords.py).
+- Recherche sémantique : les embeddings sont persistés à côté de la base
+  (`jobs.vectors`, EmbeddingFile) par `seq` ; au chargement, seuls les
+  vecteurs absents ou périmés sont recalculés.
+"""
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..models import JobPosting, SearchRequest
+from ..utils.dedupe import content_fingerprint
+from ..utils.embeddings import DIM, embed_job, embedding_stamp
+from .memory import JobDiff, MemoryStore
+from .text_index import TOKEN_RE
+from .vector_index import EmbeddingFile
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    rev INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    skills TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    fingerprint TEXT NOT NULL DEFAULT '',
+    last_seen REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_rev ON jobs(rev);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, skills,
+    content='jobs', content_rowid='seq', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, description, skills)
+    VALUES (new.seq, new.title, new.description, new.skills);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, skills)
+    VALUES ('delete', old.seq, old.title, old.description, old.skills);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, skills)
+    VALUES ('delete', old.seq, old.title, old.description, old.skills);
+    INSERT INTO jobs_fts(rowid, title, description, skills)
+    VALUES (new.seq, new.title, new.description, new.skills);
+END;
+"""
+
+UPSERT = """
+INSERT INTO jobs (id, rev, title, description, skills, data, fingerprint, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    rev = excluded.rev,
+    title = excluded.title,
+    description = excluded.description,
+    skills = excluded.skills,
+    data = excluded.data,
+    fingerprint = excluded.fingerprint,
+    last_seen = excluded.last_seen
+"""
+
+# Colonnes ajoutées après la création du schéma (bases existantes)
+MIGRATIONS = {
+    "fingerprint": "ALTER TABLE jobs ADD COLUMN fingerprint TEXT NOT NULL DEFAULT ''",
+    "last_seen": "ALTER TABLE jobs ADD COLUMN last_seen REAL NOT NULL DEFAULT 0",
+}
+
+# Lignes relues par lot lors d'un chargement / d'une synchro
+FETCH_BATCH = 5000
+
+
+def _fts_eligible(keyword: str) -> bool:
+    """Mot-clé composé cherchable en FTS trigram avec la sémantique de keyword_score.
+
+    ASCII (même repli de casse que .lower()), 3 caractères minimum (trigram)
+    et sans espace (ne peut pas chevaucher titre et description).
+    """
+    if len(keyword) < 3 or not keyword.isascii() or any(c.isspace() for c in keyword):
+        return False
+    kw_l = keyword.lower()
+    return TOKEN_RE.findall(kw_l) != [kw_l]
+
+
+def _fts_query(keyword: str) -> str:
+    return '{title description} : "' + keyword.replace('"', '""') + '"'
+
+
+class SQLiteStore(MemoryStore):
+    def __init__(self, path: str) -> None:
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, statement in MIGRATIONS.items():
+            if column not in columns:
+                self._conn.execute(statement)
+        self._rev = 0
+        self._data_version: Optional[int] = None
+        super().__init__()
+        self._embedding_file: Optional[EmbeddingFile] = None
+        if self.semantic and path != ":memory:":
+            self._embedding_file = EmbeddingFile(str(Path(path).with_suffix(".vectors")))
+        self._sync()
+
+    def clear(self) -> None:
+        """Vide les index mémoire (la base n'est pas touchée)."""
+        with self._lock:
+            super().clear()
+            self._rev = 0
+            self._data_version = None
+            self._seq_rows: Dict[int, int] = {}
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _embeddings(self, seqs: List[int], jobs: List[JobPosting]) -> Optional[np.ndarray]:
+        """Embeddings des offres (clés `seq`), relus du fichier s'ils sont à jour."""
+        if not self.semantic:
+            return None
+        if self._embedding_file is None:
+            return np.stack([embed_job(job) for job in jobs])
+        keys = np.array(seqs, dtype=np.int64)
+        stamps = np.array([embedding_stamp(job) for job in jobs], dtype=np.uint64)
+        valid = self._embedding_file.lookup(keys, stamps)
+        vectors = np.zeros((len(jobs), DIM), dtype=np.float32)
+        if valid.any():
+            vectors[valid] = self._embedding_file.vectors(keys[valid])
+        stale = np.flatnonzero(~valid)
+        if len(stale):
+            for i in stale:
+                vectors[i] = embed_job(jobs[i])
+            self._embedding_file.store(keys[stale], stamps[stale], vectors[stale])
+        return vectors
+
+    def _pull(self) -> None:
+        """Charge en mémoire les lignes écrites depuis la dernière révision vue."""
+        cursor = self._conn.execute(
+            "SELECT seq, rev, data FROM jobs WHERE rev > ? ORDER BY seq", (self._rev,)
+        )
+        while True:
+            batch = cursor.fetchmany(FETCH_BATCH)
+            if not batch:
+                break
+            jobs = [JobPosting.model_validate_json(data) for _, _, data in batch]
+            super().upsert_jobs(jobs, self._embeddings([seq for seq, _, _ in batch], jobs))
+            for (seq, _, _), job in zip(batch, jobs):
+                self._seq_rows[seq] = self._rows[job.id]
+            self._rev = max(self._rev, max(rev for _, rev, _ in batch))
+
+    def _sync(self) -> None:
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return
+            self._pull()
+            self._data_version = data_version
+
+    def upsert_jobs(self, jobs: List[JobPosting]) -> int:
+        if not jobs:
+            return 0
+        with self._lock:
+            with self._write() as conn:
+                # Écritures d'autres processus d'abord, pour garder les révisions contiguës
+                self._pull()
+                rev = conn.execute("SELECT COALESCE(MAX(rev), 0) + 1 FROM jobs").fetchone()[0]
+                now = time.time()
+                conn.executemany(
+                    UPSERT,
+                    [
+                        (
+                            job.id, rev, job.title, job.description or "", " ".join(job.skills),
+                            job.model_dump_json(), content_fingerprint(job), now,
+                        )
+                        for job in jobs
+                    ],
+                )
+                seqs = conn.execute("SELECT seq, id FROM jobs WHERE rev = ?", (rev,)).fetchall()
+            seq_of = {job_id: seq for seq, job_id in seqs}
+            super().upsert_jobs(jobs, self._embeddings([seq_of[job.id] for job in jobs], jobs))
+            for seq, job_id in seqs:
+                self._seq_rows[seq] = self._rows[job_id]
+            self._rev = rev
+        return len(jobs)
+
+    def rekey_jobs(self, rekeyed: Dict[str, JobPosting]) -> Tuple[int, int]:
+        """Change l'id d'offres stockées (ancien id -> offre avec son nouvel id).
+
+        Si le nouvel id existe déjà, l'ancienne ligne est supprimée (doublon).
+        Les index mémoire sont reconstruits ; à lancer API arrêtée, les autres
+        processus ne voient pas les suppressions. Renvoie (renommées, fusionnées).
+        """
+        renamed = merged = 0
+        with self._lock:
+            with self._write() as conn:
+                rev = conn.execute("SELECT COALESCE(MAX(rev), 0) + 1 FROM jobs").fetchone()[0]
+                for old_id, job in rekeyed.items():
+                    exists = conn.execute("SELECT 1 FROM jobs WHERE id = ?", (job.id,)).fetchone()
+                    if exists:
+                        conn.execute("DELETE FROM jobs WHERE id = ?", (old_id,))
+                        merged += 1
+                    else:
+                        conn.execute(
+                            "UPDATE jobs SET id = ?, rev = ?, data = ?, fingerprint = ? WHERE id = ?",
+                            (job.id, rev, job.model_dump_json(), content_fingerprint(job), old_id),
+                        )
+                        renamed += 1
+            self.clear()
+            self._sync()
+        return renamed, merged
+
+    def merge_jobs(self, jobs: List[JobPosting]) -> JobDiff:
+        # Empreintes à jour des écritures des autres processus avant le tri
+        self._sync()
+        return super().merge_jobs(jobs)
+
+    def touch(self, job_ids: Iterable[str]) -> None:
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        with self._lock:
+            super().touch(job_ids)
+            now = time.time()
+            with self._write() as conn:
+                conn.executemany("UPDATE jobs SET last_seen = ? WHERE id = ?", [(now, i) for i in job_ids])
+
+    def count_unseen_since(self, since: float) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE last_seen < ?", (since,)).fetchone()[0]
+
+    def _keyword_hit_rows(self, keywords: List[str]) -> Dict[int, int]:
+        hits = super()._keyword_hit_rows([kw for kw in keywords if not _fts_eligible(kw)])
+        seq_rows = self._seq_rows
+        for kw in keywords:
+            if not _fts_eligible(kw):
+                continue
+            matched: Set[int] = set()
+            for (seq,) in self._conn.execute(
+                "SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?", (_fts_query(kw),)
+            ):
+                # Lignes d'un autre processus pas encore synchronisées : ignorées
+                row = seq_rows.get(seq)
+                if row is not None:
+                    matched.add(row)
+            for row in matched:
+                hits[row] = hits.get(row, 0) + 1
+        return hits
+
+    # Lectures : synchronisation préalable avec les écritures des autres processus
+
+    def refresh(self) -> None:
+        self._sync()
+
+    def __len__(self) -> int:
+        self._sync()
+        return super().__len__()
+
+    def candidate_rows(self, req: SearchRequest) -> np.ndarray:
+        self._sync()
+        return super().candidate_rows(req)
+
+    def keyword_hits(self, keywords: List[str]) -> Dict[str, int]:
+        self._sync()
+        return super().keyword_hits(keywords)
+
+    def keyword_vector(self, keywords: List[str]) -> Optional[np.ndarray]:
+        self._sync()
+        return super().keyword_vector(keywords)
+
+    def bm25_vector(self, keywords: List[str]) -> Optional[np.ndarray]:
+        self._sync()
+        return super().bm25_vector(keywords)
+
+    def semantic_rows(self, text: str, k: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        self._sync()
+        return super().semantic_rows(text, k, rows)
+
+    def search(self, req: Optional[SearchRequest] = None) -> List[JobPosting]:
+        self._sync()
+        return super().search(req)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            if self._embedding_file is not None:
+                self._embedding_file.flush()
@@ -0,0 +1,215 @@
+"""
+Index inversé des offres (titre, description, skills), maintenu à l'upsert.
+
+Sert à `keyword_score` : au lieu de chercher chaque mot-clé en sous-chaîne
+dans le texte de chaque offre, on lit les listes de postings des termes qui
+contiennent les tokens du mot-clé. La sémantique « sous-chaîne » de
+keyword_score est conservée : une sous-chaîne du texte ne peut venir que de
+termes contenant chacun de ses tokens, et seuls les candidats ainsi obtenus
+sont vérifiés (si le mot-clé n'est pas un token simple).
+
+Sert aussi au classement BM25F (utils/bm25.py) : fréquences par champ des
+postings, longueur de chaque champ par rang et longueurs totales, tenues à
+jour à chaque ajout / retrait.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..models import JobPosting
+
+TOKEN_RE = re.compile(r"\w+")
+FIELDS = ("title", "description", "skills")
+# Champs lus par keyword_score (titre + description)
+KEYWORD_FIELDS = ("title", "description")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def field_tokens(job: JobPosting) -> Dict[str, List[str]]:
+    return {
+        "title": tokenize(job.title),
+        "description": tokenize(job.description),
+        "skills": tokenize(" ".join(job.skills)),
+    }
+
+
+class InvertedIndex:
+    """Postings par champ : terme -> {row: fréquence}."""
+
+    SUBSTRING_CACHE_SIZE = 1024
+    # Postings gardés en tableaux NumPy (BM25), en nombre total d'entrées
+    POSTING_ARRAYS_MAX = 4_000_000
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[str, Dict[int, int]]] = {f: {} for f in FIELDS}
+        # Termes présents dans les champs keyword, et cache sous-chaîne -> termes
+        self._terms: Dict[str, int] = {}
+        self._substrings: "OrderedDict[str, Set[str]]" = OrderedDict()
+        # Statistiques BM25 : longueur (tokens) des champs par rang, totaux, offres indexées
+        self.lengths: Dict[str, np.ndarray] = {f: np.zeros(1024, dtype=np.float32) for f in FIELDS}
+        self.total_length: Dict[str, int] = {f: 0 for f in FIELDS}
+        self.docs = 0
+        # Longueurs rapportées à la moyenne (invalidées à chaque écriture)
+        self._ratios: Optional[Dict[str, np.ndarray]] = None
+        # Cache (champ, terme) -> (rangs, fréquences)
+        self._arrays: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._arrays_size = 0
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.lengths[FIELDS[0]])
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        for field, arr in self.lengths.items():
+            self.lengths[field] = np.concatenate([arr, np.zeros(new_capacity - capacity, dtype=np.float32)])
+
+    def _drop_arrays(self, field: str, term: str) -> None:
+        arrays = self._arrays.pop((field, term), None)
+        if arrays is not None:
+            self._arrays_size -= len(arrays[0])
+
+    def add(self, row: int, job: JobPosting) -> None:
+        self._grow(row + 1)
+        self.docs += 1
+        self._ratios = None
+        for field, tokens in field_tokens(job).items():
+            self.lengths[field][row] = len(tokens)
+            self.total_length[field] += len(tokens)
+            postings = self.postings[field]
+            for term, tf in Counter(tokens).items():
+                if self._arrays:
+                    self._drop_arrays(field, term)
+                docs = postings.get(term)
+                if docs is None:
+                    docs = postings[term] = {}
+                    if field in KEYWORD_FIELDS:
+                        self._add_term(term)
+                docs[row] = tf
+
+    def remove(self, row: int, job: JobPosting) -> None:
+        self.docs -= 1
+        self._ratios = None
+        for field, tokens in field_tokens(job).items():
+            self.lengths[field][row] = 0
+            self.total_length[field] -= len(tokens)
+            postings = self.postings[field]
+            for term in set(tokens):
+                if self._arrays:
+                    self._drop_arrays(field, term)
+                docs = postings.get(term)
+                if docs is None:
+                    continue
+                docs.pop(row, None)
+                if not docs:
+                    del postings[term]
+                    if field in KEYWORD_FIELDS:
+                        self._drop_term(term)
+
+    def doc_freq(self, term: str) -> int:
+        """Nombre d'offres contenant le terme, sur le champ où il est le plus fréquent."""
+        return max(len(self.postings[field].get(term, ())) for field in FIELDS)
+
+    def posting_arrays(self, field: str, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(rangs, fréquences) du terme dans le champ, en tableaux NumPy (LRU)."""
+        key = (field, term)
+        arrays = self._arrays.get(key)
+        if arrays is not None:
+            self._arrays.move_to_end(key)
+            return arrays
+        docs = self.postings[field].get(term, {})
+        arrays = (
+            np.fromiter(docs.keys(), dtype=np.int64, count=len(docs)),
+            np.fromiter(docs.values(), dtype=np.float32, count=len(docs)),
+        )
+        self._arrays[key] = arrays
+        self._arrays_size += len(docs)
+        while self._arrays_size > self.POSTING_ARRAYS_MAX and len(self._arrays) > 1:
+            _, (rows, _) = self._arrays.popitem(last=False)
+            self._arrays_size -= len(rows)
+        return arrays
+
+    def length_ratios(self) -> Dict[str, np.ndarray]:
+        """Longueur de chaque champ rapportée à sa moyenne, par rang."""
+        if self._ratios is None:
+            size = len(self.lengths[FIELDS[0]])
+            self._ratios = {
+                field: self.lengths[field] / (self.total_length[field] / self.docs)
+                if self.docs and self.total_length[field] else np.zeros(size, dtype=np.float32)
+                for field in FIELDS
+            }
+        return self._ratios
+
+    def _add_term(self, term: str) -> None:
+        count = self._terms.get(term, 0)
+        self._terms[term] = count + 1
+        if count == 0:
+            for sub, terms in self._substrings.items():
+                if sub in term:
+                    terms.add(term)
+
+    def _drop_term(self, term: str) -> None:
+        count = self._terms.get(term, 0) - 1
+        if count > 0:
+            self._terms[term] = count
+            return
+        self._terms.pop(term, None)
+        for terms in self._substrings.values():
+            terms.discard(term)
+
+    def _terms_containing(self, token: str) -> Set[str]:
+        terms = self._substrings.get(token)
+        if terms is None:
+            terms = {t for t in self._terms if token in t}
+            self._substrings[token] = terms
+            if len(self._substrings) > self.SUBSTRING_CACHE_SIZE:
+                self._substrings.popitem(last=False)
+        else:
+            self._substrings.move_to_end(token)
+        return terms
+
+    def _rows_with_token(self, token: str) -> Set[int]:
+        rows: Set[int] = set()
+        for term in self._terms_containing(token):
+            for field in KEYWORD_FIELDS:
+                rows.update(self.postings[field].get(term, ()))
+        return rows
+
+    def keyword_hits(
+        self,
+        keywords: Iterable[str],
+        text_of: Callable[[int], str],
+        all_rows: Callable[[], Iterable[int]],
+    ) -> Dict[int, int]:
+        """Nombre de mots-clés présents (sous-chaîne) par row, comme keyword_score.
+
+        `text_of(row)` renvoie le texte « titre description » en minuscules,
+        utilisé seulement pour vérifier les mots-clés composés.
+        """
+        hits: Dict[int, int] = {}
+        for kw in keywords:
+            kw_l = kw.lower()
+            tokens = TOKEN_RE.findall(kw_l)
+            if not tokens:
+                # Ponctuation seule (ou vide) : pas de token à indexer, scan
+                rows: Iterable[int] = [r for r in all_rows() if kw_l in text_of(r)]
+            else:
+                candidates = None
+                for token in sorted(set(tokens), key=len, reverse=True):
+                    found = self._rows_with_token(token)
+                    candidates = found if candidates is None else candidates & found
+                    if not candidates:
+                        break
+                if tokens == [kw_l]:
+                    rows = candidates
+                else:
+                    rows = [r for r in candidates if kw_l in text_of(r)]
+            for row in rows:
+                hits[row] = hits.get(row, 0) + 1
+        return hits
@@ -0,0 +1,188 @@
+"""
+Index ANN des embeddings d'offres (IVF) et leur persistance sur disque.
+
+IVFIndex (en mémoire, un vecteur float16 par rang du store) :
+- en dessous de MIN_TRAIN vecteurs, recherche exacte (produit scalaire sur
+  tout le corpus) ;
+- au-delà, k-means sphérique (~sqrt(n) centroïdes, entraîné sur un
+  échantillon) ; chaque vecteur est rangé dans la liste de son centroïde le
+  plus proche dès son ajout (mise à jour incrémentale à l'upsert), et les
+  centroïdes sont réentraînés quand le corpus a doublé ;
+- une requête parcourt les `nprobe` listes les plus proches et ne calcule la
+  similarité que pour leurs offres.
+
+EmbeddingFile : vecteurs persistés dans un memmap NumPy à côté de la base
+(`data/jobs.vectors`), un enregistrement (stamp, vecteur) par `seq` SQLite.
+Le stamp identifie le contenu embeddé (embedding_stamp) : au redémarrage,
+seuls les vecteurs absents ou périmés sont recalculés. Les vecteurs ne
+dépendant que du contenu, deux processus qui écrivent le même `seq` y
+écrivent les mêmes octets ; le fichier ne fait que grandir (ajout en fin).
+"""
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from ..utils.embeddings import DIM
+
+MIN_TRAIN = 2048
+# Points d'entraînement par centroïde, itérations du k-means
+TRAIN_POINTS = 64
+KMEANS_ITERS = 10
+# Lignes traitées par produit matriciel lors de l'affectation aux centroïdes
+ASSIGN_BATCH = 65536
+
+RECORD = np.dtype([("stamp", "<u8"), ("vector", "<f2", (DIM,))])
+
+
+class IVFIndex:
+    def __init__(self, capacity: int = 1024) -> None:
+        self.size = 0
+        self.vectors = np.zeros((capacity, DIM), dtype=np.float16)
+        self.present = np.zeros(capacity, dtype=bool)
+        self.assign = np.full(capacity, -1, dtype=np.int32)
+        self.centroids: Optional[np.ndarray] = None
+        self._trained_on = 0
+        # Rangs par liste (concaténés) et bornes, reconstruits après écriture
+        self._list_rows: Optional[np.ndarray] = None
+        self._list_bounds: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return int(self.present[: self.size].sum())
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.present)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        extra = new_capacity - capacity
+        self.vectors = np.concatenate([self.vectors, np.zeros((extra, DIM), dtype=np.float16)])
+        self.present = np.concatenate([self.present, np.zeros(extra, dtype=bool)])
+        self.assign = np.concatenate([self.assign, np.full(extra, -1, dtype=np.int32)])
+
+    def set(self, row: int, vector: np.ndarray) -> None:
+        self._grow(row + 1)
+        self.vectors[row] = vector
+        self.present[row] = True
+        self.size = max(self.size, row + 1)
+        if self.centroids is not None:
+            self.assign[row] = int(np.argmax(self.centroids @ vector.astype(np.float32)))
+        self._list_rows = None
+
+    def _assign(self, rows: np.ndarray) -> None:
+        for i in range(0, len(rows), ASSIGN_BATCH):
+            batch = rows[i:i + ASSIGN_BATCH]
+            sims = self.vectors[batch].astype(np.float32) @ self.centroids.T
+            self.assign[batch] = np.argmax(sims, axis=1)
+
+    def _train(self) -> None:
+        rows = np.flatnonzero(self.present[: self.size])
+        nlist = max(1, int(math.sqrt(len(rows))))
+        rng = np.random.default_rng(len(rows))
+        sample = rows if len(rows) <= nlist * TRAIN_POINTS else rng.choice(rows, nlist * TRAIN_POINTS, replace=False)
+        points = self.vectors[sample].astype(np.float32)
+        centroids = points[rng.choice(len(points), nlist, replace=False)]
+        for _ in range(KMEANS_ITERS):
+            labels = np.argmax(points @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, points)
+            norms = np.linalg.norm(sums, axis=1)
+            # Centroïde vide : repris sur un point au hasard
+            empty = norms == 0
+            sums[empty] = points[rng.choice(len(points), int(empty.sum()))]
+            norms[empty] = 1.0
+            centroids = sums / norms[:, None]
+        self.centroids = centroids
+        self._trained_on = len(rows)
+        self._assign(rows)
+        self._list_rows = None
+        print(f"[VectorIndex] Trained {nlist} lists on {len(rows)} vectors")
+
+    def _lists(self) -> None:
+        rows = np.flatnonzero(self.present[: self.size])
+        labels = self.assign[rows]
+        order = np.argsort(labels, kind="stable")
+        self._list_rows = rows[order]
+        self._list_bounds = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(self.centroids)))])
+
+    def search(self, query: np.ndarray, k: int, nprobe: int, allowed: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rangs des k vecteurs les plus proches de `query` (similarité décroissante).
+
+        `allowed` : rangs triés auxquels limiter la recherche (filtres durs).
+        """
+        count = len(self)
+        if count >= MIN_TRAIN and (self.centroids is None or count >= 2 * self._trained_on):
+            self._train()
+        query = query.astype(np.float32)
+        if self.centroids is None:
+            rows = np.flatnonzero(self.present[: self.size])
+        else:
+            if self._list_rows is None:
+                self._lists()
+            probes = np.argsort(self.centroids @ query)[::-1][:nprobe]
+            bounds = self._list_bounds
+            rows = np.concatenate([self._list_rows[bounds[p]:bounds[p + 1]] for p in probes])
+        if allowed is not None:
+            rows = rows[np.isin(rows, allowed)]
+        if not len(rows):
+            return rows.astype(np.int64)
+        sims = self.vectors[rows].astype(np.float32) @ query
+        if k < len(rows):
+            top = np.argpartition(-sims, k - 1)[:k]
+            rows, sims = rows[top], sims[top]
+        return rows[np.argsort(-sims, kind="stable")].astype(np.int64)
+
+
+class EmbeddingFile:
+    """Vecteurs persistés par clé (seq), valides si leur stamp correspond."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        self._map: Optional[np.memmap] = None
+        self._open()
+
+    def _open(self) -> None:
+        records = self.path.stat().st_size // RECORD.itemsize
+        self._map = np.memmap(self.path, dtype=RECORD, mode="r+", shape=(records,)) if records else None
+
+    def __len__(self) -> int:
+        return 0 if self._map is None else len(self._map)
+
+    def _grow(self, needed: int) -> None:
+        self._open()
+        if needed <= len(self):
+            return
+        extra = max(needed, 2 * len(self), 1024) - len(self)
+        # Ajout en fin uniquement : un autre processus ne voit jamais le fichier rétrécir
+        with open(self.path, "ab") as f:
+            f.write(np.zeros(extra, dtype=RECORD).tobytes())
+        self._open()
+
+    def lookup(self, keys: np.ndarray, stamps: np.ndarray) -> np.ndarray:
+        """Masque des clés dont le vecteur persisté est à jour."""
+        if len(keys) and keys.max() >= len(self):
+            self._open()
+        valid = keys < len(self)
+        if self._map is not None and valid.any():
+            valid[valid] = self._map["stamp"][keys[valid]] == stamps[valid]
+        return valid
+
+    def vectors(self, keys: np.ndarray) -> np.ndarray:
+        return np.asarray(self._map["vector"][keys])
+
+    def store(self, keys: np.ndarray, stamps: np.ndarray, vectors: np.ndarray) -> None:
+        if not len(keys):
+            return
+        self._grow(int(keys.max()) + 1)
+        self._map["vector"][keys] = vectors
+        self._map["stamp"][keys] = stamps
+
+    def flush(self) -> None:
+        if self._map is not None:
+            self._map.flush()
+
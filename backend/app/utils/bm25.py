@@ -0,0 +1,64 @@
+"""
+Classement BM25F (titre, skills, description), alternative à keyword_score.
+
+keyword_score ne compte que la part de mots-clés présents : toutes les offres
+« python » ont le même score. BM25F tient compte de la fréquence des termes,
+du champ où ils apparaissent (poids par champ, normalisation de longueur par
+champ) et de leur rareté (IDF) :
+
+    tf~(t, d) = Σ_champ poids · tf / (1 - b + b · longueur / longueur moyenne)
+    score(d)  = Σ_t idf(t) · tf~ · (K1 + 1) / (K1 + tf~)
+
+Les termes sont les tokens des mots-clés (mêmes tokens que l'index inversé,
+correspondance exacte et non en sous-chaîne). Le score est divisé par le
+meilleur score du corpus : il reste dans [0, 1] et passe par score_rows
+(pénalités, arrondi, clé de tri) comme la part de mots-clés.
+"""
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+
+from ..storage.text_index import InvertedIndex, tokenize
+
+K1 = 1.2
+# Champ -> (poids, b)
+FIELD_PARAMS = {
+    "title": (3.0, 0.5),
+    "skills": (2.0, 0.3),
+    "description": (1.0, 0.75),
+}
+
+
+def query_terms(keywords: List[str]) -> Counter:
+    terms: Counter = Counter()
+    for kw in keywords:
+        terms.update(tokenize(kw))
+    return terms
+
+
+def bm25f_scores(index: InvertedIndex, size: int, keywords: List[str]) -> Optional[np.ndarray]:
+    """Score BM25F normalisé (meilleur = 1) par rang, None sans terme de requête."""
+    terms = query_terms(keywords)
+    if not terms:
+        return None
+    n = index.docs
+    ratios = index.length_ratios()
+    scores = np.zeros(size)
+    tf = np.zeros(size, dtype=np.float32)
+    for term, count in terms.items():
+        for field, (weight, b) in FIELD_PARAMS.items():
+            rows, freqs = index.posting_arrays(field, term)
+            if len(rows):
+                tf[rows] += weight * freqs / (1.0 - b + b * ratios[field][rows])
+        hit = np.flatnonzero(tf)
+        if not len(hit):
+            continue
+        idf = math.log(1.0 + (n - len(hit) + 0.5) / (len(hit) + 0.5))
+        scores[hit] += count * idf * tf[hit] * (K1 + 1.0) / (K1 + tf[hit])
+        tf[hit] = 0
+    top = scores.max() if size else 0.0
+    return scores / top if top > 0 else scores
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import hashlib
-from typing import Iterable, List
+import math
+import threading
+from typing import Iterable, List, Optional, Protocol
 
 from ..models import JobPosting
 
@@ -18,14 +20,78 @@ def compute_hash(job: JobPosting) -> str:
     return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
 
-def deduplicate(jobs: Iterable[JobPosting]) -> List[JobPosting]:
-    seen = set()
-    unique: List[JobPosting] = []
-    for job in jobs:
-        h = compute_hash(job)
-        if h in seen:
-            continue
-        seen.add(h)
-        unique.append(job)
-    return unique
+def content_fingerprint(job: JobPosting) -> str:
+    """Empreinte de contenu : identité (compute_hash) + digest de la description.
 
+    Stockée par offre pour repérer, d'un scraping à l'autre, les offres
+    inchangées (même empreinte) et ne pas les réécrire.
+    """
+    description = hashlib.sha256((job.description or "").encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{compute_hash(job)}|{description}".encode("utf-8")).hexdigest()
+
+
+class SeenHashes(Protocol):
+    def add(self, h: str) -> bool: ...
+
+
+class HashSet:
+    """Hash déjà vus, partagés entre threads (test-et-ajout atomique)."""
+
+    def __init__(self) -> None:
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+
+    def add(self, h: str) -> bool:
+        """True si le hash est nouveau."""
+        with self._lock:
+            if h in self._seen:
+                return False
+            self._seen.add(h)
+            return True
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class BloomFilter:
+    """Filtre de Bloom sur les hash sha256 de compute_hash (mémoire fixe).
+
+    Pour les gros runs : taille en bits calculée pour `capacity` éléments et
+    un taux de faux positifs `error_rate` (une offre nouvelle prise pour un
+    doublon avec cette probabilité).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, h: str) -> List[int]:
+        # Double hashing à partir de deux tranches du sha256
+        h1 = int(h[:16], 16)
+        h2 = int(h[16:32], 16) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, h: str) -> bool:
+        """True si le hash n'était (probablement) pas encore présent."""
+        positions = self._positions(h)
+        with self._lock:
+            bits = self._bits
+            if all(bits[p >> 3] & (1 << (p & 7)) for p in positions):
+                return False
+            for p in positions:
+                bits[p >> 3] |= 1 << (p & 7)
+            self._count += 1
+            return True
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def deduplicate(jobs: Iterable[JobPosting], seen: Optional[SeenHashes] = None) -> List[JobPosting]:
+    """Offres uniques (compute_hash) ; `seen` partagé pour dédupliquer sur plusieurs lots."""
+    if seen is None:
+        seen = HashSet()
+    return [job for job in jobs if seen.add(compute_hash(job))]
@@ -0,0 +1,110 @@
+"""
+Embeddings locaux des offres et des requêtes (TF-IDF hashé + projection aléatoire).
+
+Pas de modèle à télécharger ni à entraîner : chaque terme (mêmes tokens
+que l'index inversé) est projeté par hachage sur HASHES dimensions signées d'un
+espace de DIM dimensions (projection aléatoire creuse, qui préserve le
+produit scalaire des vecteurs TF-IDF hashés). Le vecteur est normalisé L2 :
+produit scalaire = similarité cosinus.
+
+- Offre : tf sous-linéaire (1 + log tf) pondéré par champ (titre et skills
+  comptent double), mots vides écartés. Le vecteur ne dépend que du contenu
+  de l'offre : il peut être persisté et partagé entre processus (cf.
+  `embedding_stamp`).
+- Requête : l'IDF est appliqué côté requête, à partir des fréquences
+  documentaires courantes du store (index inversé).
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..models import JobPosting, SearchRequest
+from ..storage.text_index import tokenize
+
+DIM = 128
+HASHES = 2
+# À incrémenter si le calcul des vecteurs change (invalide les vecteurs persistés)
+EMBEDDING_VERSION = 1
+
+FIELD_WEIGHTS = (("title", 2.0), ("skills", 2.0), ("description", 1.0))
+STOPWORDS = frozenset(
+    """
+    a au aux avec ce ces dans de des du elle en et il ils je la le les leur lui mais me mes
+    mon ne nos notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes ton tu
+    un une vos votre vous y l d s n c j m
+    an and are as at be by for from has have in is it its of on or that the this to was
+    we will with you your
+    """.split()
+)
+
+
+@lru_cache(maxsize=1 << 18)
+def _term_slots(term: str) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """Dimensions et signes d'un terme (HASHES octets de dimension + bits de signe)."""
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+    dims = tuple(digest[i] % DIM for i in range(HASHES))
+    signs = tuple(1.0 if digest[7] >> i & 1 else -1.0 for i in range(HASHES))
+    return dims, signs
+
+
+def terms(text: Optional[str]) -> List[str]:
+    return [t for t in tokenize(text) if t not in STOPWORDS]
+
+
+def _project(weights: Iterable[Tuple[str, float]]) -> np.ndarray:
+    vec = np.zeros(DIM, dtype=np.float32)
+    dims: List[int] = []
+    values: List[float] = []
+    for term, weight in weights:
+        term_dims, signs = _term_slots(term)
+        dims.extend(term_dims)
+        values.extend(weight * s for s in signs)
+    if dims:
+        np.add.at(vec, dims, values)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+def job_text_weights(job: JobPosting) -> Counter:
+    tf: Counter = Counter()
+    texts = {"title": job.title, "skills": " ".join(job.skills), "description": job.description}
+    for field, weight in FIELD_WEIGHTS:
+        for term, count in Counter(terms(texts[field])).items():
+            tf[term] += weight * (1.0 + math.log(count))
+    return tf
+
+
+def embed_job(job: JobPosting) -> np.ndarray:
+    return _project(job_text_weights(job).items())
+
+
+def embed_query(text: str, idf: Callable[[str], float]) -> Optional[np.ndarray]:
+    """Vecteur d'une requête, pondéré par `idf(terme)` ; None si aucun terme."""
+    tf = Counter(terms(text))
+    if not tf:
+        return None
+    vec = _project((term, (1.0 + math.log(count)) * idf(term)) for term, count in tf.items())
+    return vec if vec.any() else None
+
+
+def embedding_stamp(job: JobPosting) -> int:
+    """Identifiant (non nul) du vecteur d'une offre : champs embeddés + version du calcul."""
+    h = hashlib.blake2b(f"{EMBEDDING_VERSION}|{DIM}|{HASHES}".encode("utf-8"), digest_size=8)
+    for text in (job.title, "\x1f".join(job.skills), job.description or ""):
+        h.update(b"\0" + text.encode("utf-8"))
+    return int.from_bytes(h.digest(), "little") | 1
+
+
+def semantic_query(req: SearchRequest) -> Optional[str]:
+    """Texte de la recherche sémantique (mots-clés + résumé CV), None si inactive."""
+    if not settings.semantic_search:
+        return None
+    text = " ".join([*req.keywords, req.cv_summary or ""]).strip()
+    return text or None
@@ -0,0 +1,96 @@
+"""
+Identifiants stables des offres scrapées.
+
+Un id ne doit dépendre que de l'offre, jamais de sa position dans la page :
+sinon chaque requête écrase les offres de la précédente au même index.
+Par ordre de préférence :
+1. identifiant natif de la source (data-jk Indeed, numIdOffre APEC) ;
+2. URL de l'offre normalisée (hôte en minuscules, sans fragment ni
+   paramètres de tracking, paramètres triés) ;
+3. contenu (titre, entreprise, ville) si la carte n'a pas de lien.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..models import JobPosting
+
+# Paramètres d'URL sans rapport avec l'offre (tracking, pagination de recherche)
+_IGNORED_PARAMS = re.compile(r"^(utm_.*|from|vjk|advn|tk|xkcb|fbclid|gclid|page|query|q)$", re.I)
+# Ids positionnels des anciennes versions des connecteurs
+LEGACY_ID_RE = re.compile(r"^(wttj|remotive|apec|indeed)-(indeed-)?\d+$")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    """URL canonique d'une offre, None si ce n'est pas une page d'offre (racine du site)."""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    if not parts.netloc or parts.path in ("", "/"):
+        return None
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if not _IGNORED_PARAMS.match(k))
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), parts.path.rstrip("/"), urlencode(query), ""))
+
+
+def content_key(parts: Iterable[Optional[str]]) -> str:
+    return _digest("|".join(" ".join((p or "").lower().split()) for p in parts))
+
+
+def stable_job_id(
+    prefix: str,
+    native: Optional[str] = None,
+    url: Optional[str] = None,
+    content: Iterable[Optional[str]] = (),
+) -> str:
+    """Id `<prefix>-<clé>` : natif, sinon digest de l'URL, sinon digest du contenu."""
+    if native:
+        return f"{prefix}-{native}"
+    canonical = normalize_url(url)
+    if canonical:
+        return f"{prefix}-{_digest(canonical)}"
+    return f"{prefix}-{content_key(content)}"
+
+
+# Champs de contenu utilisés par chaque connecteur quand l'offre n'a ni id natif ni URL
+_CONTENT_FIELDS = {
+    "wttj": ("title", "company"),
+    "remotive": ("title", "company"),
+    "apec": ("title", "company", "city"),
+    "indeed": ("title", "company", "city"),
+}
+
+
+def migrated_id(job: JobPosting) -> Optional[str]:
+    """Id stable d'une offre stockée avec un ancien id positionnel, None si l'id est déjà stable.
+
+    Recalcule ce que produiraient les connecteurs actuels à partir des
+    champs stockés (apply_url, titre, entreprise, ville).
+    """
+    match = LEGACY_ID_RE.match(job.id)
+    if not match:
+        return None
+    prefix = match.group(1)
+    url = job.apply_url
+    query = dict(parse_qsl(urlsplit(url).query)) if url else {}
+    native = None
+    if prefix == "apec":
+        found = re.search(r"numIdOffre=(\d+)", url or "")
+        native = found.group(1) if found else None
+    elif prefix == "indeed":
+        jk = query.get("jk")
+        if jk and LEGACY_ID_RE.match(jk):
+            # URL de repli construite sur l'ancien id positionnel : inutilisable
+            url = None
+        else:
+            native = jk
+    content = [getattr(job, f) for f in _CONTENT_FIELDS[prefix]]
+    new_id = stable_job_id(prefix, native=native, url=url, content=content)
+    # apec-<numIdOffre> / indeed-<data-jk numérique> : déjà stables
+    return None if new_id == job.id else new_id
@@ -0,0 +1,225 @@
+"""
+Détection de quasi-doublons entre sources (MinHash + LSH).
+
+compute_hash n'attrape que les doublons exacts d'une même source ; une offre
+publiée sur Indeed, APEC et WTTJ reste en 2-3 exemplaires. Ici :
+
+- shingles : bigrammes de mots du titre, de l'entreprise et de la description
+  normalisés (minuscules, sans accents) ;
+- signature MinHash (NUM_PERM permutations universelles, NumPy) ;
+- LSH : BANDS bandes de ROWS lignes. Chaque bande est indexée deux fois,
+  avec deux clés de blocage : les mots du titre (hors mentions H/F, CDI...)
+  et l'entreprise normalisée. Chaque source formule l'entreprise à sa façon
+  (« Acme » / « ACME SAS ») : il suffit que l'une des deux clés coïncide.
+  Les entreprises génériques (« Entreprise », « Confidentiel »...) ne
+  bloquent pas, elles mettraient dans un même bloc des offres sans rapport.
+  Les candidats d'une offre sont les offres partageant au moins une bande,
+  la recherche ne parcourt donc pas tout le corpus ;
+- vérification : similarité estimée (part de minhash égaux) >= THRESHOLD,
+  et entreprises compatibles (mots de l'une inclus dans ceux de l'autre,
+  hors SAS, France...) : deux employeurs différents ne publient pas la même
+  offre. Une entreprise générique est compatible avec toutes.
+
+Les offres similaires forment un cluster dont le représentant canonique est
+le plus ancien membre (plus petit rang d'insertion). Une offre proche de
+plusieurs clusters les fusionne (A~B et B~C : un seul cluster).
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+import zlib
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..models import JobPosting
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.6
+SHINGLE_SIZE = 2
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+_WORD_RE = re.compile(r"\w+")
+# Mentions ajoutées au titre selon la source, ignorées pour le blocage
+TITLE_NOISE = frozenset(
+    "h f hf fh m w x d cdi cdd stage alternance interim freelance remote teletravail".split()
+)
+# Formes juridiques et compléments ajoutés au nom selon la source
+COMPANY_NOISE = frozenset("sa sas sasu sarl eurl group groupe france fr inc ltd gmbh".split())
+# Entreprises masquées ou génériques : ni blocage ni contrôle sur l'entreprise
+PLACEHOLDER_COMPANIES = frozenset(
+    {
+        "entreprise", "entreprise confidentielle", "societe", "societe confidentielle",
+        "confidentiel", "confidentielle", "confidential", "anonyme", "anonymous",
+        "non communique", "nc", "n a", "na", "inconnu", "unknown", "company", "client",
+    }
+)
+
+
+def normalize(text: Optional[str]) -> List[str]:
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    return _WORD_RE.findall("".join(c for c in text if not unicodedata.combining(c)))
+
+
+def shingles(job: JobPosting) -> Set[str]:
+    words = normalize(job.title) + normalize(job.company) + normalize(job.description)
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def company_tokens(job: JobPosting) -> FrozenSet[str]:
+    """Mots significatifs de l'entreprise ; vide si absente ou générique."""
+    words = normalize(job.company)
+    if " ".join(words) in PLACEHOLDER_COMPANIES:
+        return frozenset()
+    return frozenset(w for w in words if w not in COMPANY_NOISE)
+
+
+def same_employer(a: FrozenSet[str], b: FrozenSet[str]) -> bool:
+    return not a or not b or a <= b or b <= a
+
+
+def block_keys(job: JobPosting) -> Tuple[bytes, ...]:
+    """Clés de blocage : mots du titre (triés, sans mentions) et entreprise si significative."""
+    keys = []
+    title = sorted({w for w in normalize(job.title) if w not in TITLE_NOISE})
+    if title:
+        keys.append(b"t" + " ".join(title).encode("utf-8") + b"\0")
+    company = company_tokens(job)
+    if company:
+        keys.append(b"c" + " ".join(sorted(company)).encode("utf-8") + b"\0")
+    return tuple(keys)
+
+
+def signature(job: JobPosting) -> np.ndarray:
+    x = np.fromiter((zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingles(job)), dtype=np.uint64)
+    # (a·x + b) mod p tient dans 64 bits (a < 2^31, x < 2^31)
+    return ((np.outer(_A, x) + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard estimé entre deux signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """Index LSH par rang d'insertion, avec clusters de quasi-doublons."""
+
+    def __init__(self) -> None:
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._blocks: Dict[int, Tuple[bytes, ...]] = {}
+        self._companies: Dict[int, FrozenSet[str]] = {}
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(BANDS)]
+        self._canonical: Dict[int, int] = {}
+        self._members: Dict[int, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _bands(blocks: Tuple[bytes, ...], sig: np.ndarray) -> List[Tuple[int, bytes]]:
+        """(bande, clé) pour chaque clé de blocage."""
+        return [(b, block + sig[b * ROWS:(b + 1) * ROWS].tobytes()) for block in blocks for b in range(BANDS)]
+
+    def candidates(self, job: JobPosting, sig: Optional[np.ndarray] = None) -> Set[int]:
+        """Offres partageant au moins une bande LSH avec `job`."""
+        if sig is None:
+            sig = signature(job)
+        rows: Set[int] = set()
+        for band, key in self._bands(block_keys(job), sig):
+            rows.update(self._buckets[band].get(key, ()))
+        return rows
+
+    def canonical(self, row: int) -> int:
+        return self._canonical.get(row, row)
+
+    def cluster(self, row: int) -> Set[int]:
+        canonical = self.canonical(row)
+        return self._members.get(canonical, {canonical})
+
+    def add(self, row: int, job: JobPosting) -> Dict[int, int]:
+        """Indexe une offre ; renvoie les rangs dont le canonique a changé."""
+        sig = signature(job)
+        blocks = block_keys(job)
+        company = company_tokens(job)
+        matches = sorted(
+            (
+                (sim, other)
+                for other in self.candidates(job, sig)
+                if same_employer(company, self._companies[other])
+                and (sim := similarity(sig, self._signatures[other])) >= THRESHOLD
+            ),
+            key=lambda m: (-m[0], m[1]),
+        )
+        self._signatures[row] = sig
+        self._blocks[row] = blocks
+        self._companies[row] = company
+        for band, key in self._bands(blocks, sig):
+            self._buckets[band].setdefault(key, set()).add(row)
+        if not matches:
+            return {row: row}
+        # Union des clusters touchés, du plus proche au moins proche, tant que leurs
+        # entreprises restent compatibles (une offre « Confidentiel » ne relie pas
+        # deux employeurs) ; le plus ancien membre (ex. réinsertion) devient canonique
+        members = {row}
+        employers = {company} - {frozenset()}
+        for _, other in matches:
+            canonical = self.canonical(other)
+            if canonical in members:
+                continue
+            cluster = self._members.get(canonical, {canonical})
+            companies = {self._companies[m] for m in cluster} - {frozenset()}
+            if all(same_employer(a, b) for a in employers for b in companies):
+                members |= self._members.pop(canonical, cluster)
+                employers |= companies
+        canonical = min(members)
+        self._members[canonical] = members
+        changes = {}
+        for member in members:
+            if member == row or self.canonical(member) != canonical:
+                changes[member] = canonical
+            if member == canonical:
+                self._canonical.pop(member, None)
+            else:
+                self._canonical[member] = canonical
+        return changes
+
+    def remove(self, row: int) -> Dict[int, int]:
+        """Désindexe une offre ; renvoie les rangs dont le canonique a changé."""
+        sig = self._signatures.pop(row, None)
+        if sig is None:
+            return {}
+        self._companies.pop(row, None)
+        for band, key in self._bands(self._blocks.pop(row), sig):
+            bucket = self._buckets[band]
+            rows = bucket.get(key)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del bucket[key]
+        canonical = self._canonical.pop(row, row)
+        members = self._members.get(canonical)
+        if members is None:
+            return {}
+        members.discard(row)
+        if canonical != row:
+            if len(members) == 1:
+                del self._members[canonical]
+            return {}
+        # Le canonique s'en va : le plus ancien membre restant le remplace
+        del self._members[row]
+        successor = min(members)
+        self._canonical.pop(successor, None)
+        if len(members) > 1:
+            self._members[successor] = members
+        for member in members:
+            if member != successor:
+                self._canonical[member] = successor
+        return {member: successor for member in members}
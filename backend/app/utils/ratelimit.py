@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from ..config import settings
+
+
+class HostLimiter:
+    """Plafonne le nombre de requêtes simultanées par hôte (sémaphore par hôte)."""
+
+    def __init__(self, max_per_host: int) -> None:
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._slots.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.max_per_host)
+                self._slots[host] = sem
+            return sem
+
+    @contextmanager
+    def slot(self, host: str, timeout: Optional[float] = None) -> Iterator[None]:
+        """Occupe un créneau de `host` ; TimeoutError s'il ne s'en libère aucun en `timeout` s."""
+        sem = self._semaphore(host)
+        if not sem.acquire(timeout=timeout):
+            raise TimeoutError(f"Aucun créneau libre pour {host} en {timeout:.1f}s")
+        try:
+            yield
+        finally:
+            sem.release()
+
+
+host_limiter = HostLimiter(settings.host_concurrency)
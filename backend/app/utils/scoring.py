@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import math
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 
 from ..models import JobPosting, SearchRequest
 
@@ -33,21 +33,70 @@ def constraint_penalty(job: JobPosting, req: SearchRequest) -> float:
     return penalty
 
 
-def score_job(job: JobPosting, req: SearchRequest) -> JobPosting:
-    title_desc = f"{job.title} {job.description or ''}"
-    kw_score = keyword_score(req.keywords, title_desc)
-    cv_score = keyword_score(req.keywords, " ".join(req.languages) + " " + (req.cv_summary or ""))
+def cv_keyword_score(req: SearchRequest) -> float:
+    """Part des mots-clés présents dans langues + résumé CV (constant pour une requête).
+
+    Nul en mode BM25 : ce plancher commun écraserait le classement par pertinence.
+    """
+    if req.ranking == "bm25":
+        return 0.0
+    return keyword_score(req.keywords, " ".join(req.languages) + " " + (req.cv_summary or ""))
+
+
+class ScoredJob(NamedTuple):
+    """Résultat de scoring d'une requête, sans toucher à l'offre stockée.
+
+    Les raisons se déduisent de `kw_score` (cf. score_reasons) et ne sont
+    construites que pour les offres effectivement renvoyées.
+    """
+    job_id: str
+    score: float
+    kw_score: float
+
+
+def score(
+    job: JobPosting,
+    req: SearchRequest,
+    kw_score: Optional[float] = None,
+    cv_score: Optional[float] = None,
+) -> ScoredJob:
+    """Score une offre ; `kw_score`/`cv_score` peuvent être précalculés (index, requête)."""
+    if kw_score is None:
+        kw_score = keyword_score(req.keywords, f"{job.title} {job.description or ''}")
+    if cv_score is None:
+        cv_score = cv_keyword_score(req)
     base = max(kw_score, cv_score)
     penalties = constraint_penalty(job, req)
-    score = max(0.0, min(1.0, base - penalties))
-    job.match_score = round(score, 3)
+    value = max(0.0, min(1.0, base - penalties))
+    return ScoredJob(job.id, round(value, 3), kw_score)
+
+
+def score_reasons(job: JobPosting, req: SearchRequest, kw_score: float) -> List[str]:
     reasons: List[str] = []
-    if kw_score > 0:
+    if kw_score > 0 and req.ranking == "bm25":
+        reasons.append(f"Pertinence BM25 ({math.ceil(kw_score*100)}%)")
+    elif kw_score > 0:
         reasons.append(f"Mots-clés trouvés ({math.ceil(kw_score*100)}%)")
     if req.remote_preference:
         reasons.append(f"Remote attendu: {req.remote_preference}, offre: {job.remote_type or 'n/a'}")
     if req.contract_types:
         reasons.append(f"Contrat cible: {', '.join(req.contract_types)}")
-    job.reasons = reasons
-    return job
+    return reasons
+
+
+def materialize(job: JobPosting, scored: ScoredJob, req: SearchRequest) -> JobPosting:
+    """Copie de l'offre avec score et raisons de la requête (l'original reste intact)."""
+    return job.model_copy(
+        update={"match_score": scored.score, "reasons": score_reasons(job, req, scored.kw_score)}
+    )
+
+
+def score_job(
+    job: JobPosting,
+    req: SearchRequest,
+    kw_score: Optional[float] = None,
+    cv_score: Optional[float] = None,
+) -> JobPosting:
+    """Offre scorée (copie) : score + raisons pour la requête."""
+    return materialize(job, score(job, req, kw_score, cv_score), req)
 
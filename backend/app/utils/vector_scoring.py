@@ -0,0 +1,98 @@
+"""
+Scoring vectorisé (NumPy) d'une SearchRequest sur les colonnes du store.
+
+Reproduit exactement `scoring.score` : mêmes pénalités ajoutées dans le même
+ordre, même clamp, et arrondi via `round()` Python appliqué aux valeurs
+distinctes (peu nombreuses) pour éviter les écarts de np.round.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..models import SearchRequest
+from ..storage.columns import JobColumns
+
+PENALTY = 0.2
+# Clé de tri entière : (1000 - score en millièmes) << ROW_BITS | rang
+ROW_BITS = 40
+
+
+@dataclass
+class ScoredRows:
+    rows: np.ndarray
+    scores: np.ndarray
+    kw: np.ndarray
+    keys: np.ndarray
+
+
+def _category_penalty(columns: JobColumns, field: str, rows: np.ndarray, wanted: List[str]) -> np.ndarray:
+    codes = columns.codes[field][rows]
+    wanted_codes = [c for c in (columns.code(field, v) for v in wanted) if c is not None]
+    return (codes != 0) & ~np.isin(codes, wanted_codes)
+
+
+def sort_key(score: float, row: int) -> int:
+    return ((1000 - int(round(score * 1000))) << ROW_BITS) | row
+
+
+def score_rows(
+    columns: JobColumns,
+    rows: np.ndarray,
+    req: SearchRequest,
+    kw: Optional[np.ndarray],
+    cv_score: float,
+) -> ScoredRows:
+    """Scores arrondis des `rows` ; `kw` = part de mots-clés trouvés par rang (ou None)."""
+    penalty = np.zeros(len(rows))
+    if req.remote_preference:
+        penalty = penalty + np.where(
+            _category_penalty(columns, "remote_type", rows, [req.remote_preference]), PENALTY, 0.0
+        )
+    if req.contract_types:
+        penalty = penalty + np.where(
+            _category_penalty(columns, "contract_type", rows, req.contract_types), PENALTY, 0.0
+        )
+    if req.countries:
+        penalty = penalty + np.where(
+            _category_penalty(columns, "country", rows, req.countries), PENALTY, 0.0
+        )
+    if req.salary_min:
+        with np.errstate(invalid="ignore"):
+            below = columns.salary_min[rows] < req.salary_min
+        penalty = penalty + np.where(below, PENALTY, 0.0)
+
+    kw_rows = kw[rows] if kw is not None else np.zeros(len(rows))
+    base = np.maximum(kw_rows, cv_score)
+    value = np.maximum(0.0, np.minimum(1.0, base - penalty))
+
+    distinct, inverse = np.unique(value, return_inverse=True)
+    rounded = np.array([round(float(v), 3) for v in distinct])
+    millis = np.rint(rounded * 1000).astype(np.int64)
+    keys = ((1000 - millis[inverse]) << ROW_BITS) | rows.astype(np.int64)
+    return ScoredRows(rows, rounded[inverse], kw_rows, keys)
+
+
+def decode_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(rangs, scores arrondis) encodés dans des clés de tri."""
+    rows = keys & ((1 << ROW_BITS) - 1)
+    scores = (1000 - (keys >> ROW_BITS)) / 1000
+    return rows, scores
+
+
+def top_k(keys: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """Indices des k plus petites clés, triés (argpartition puis tri du top)."""
+    if k is None or k >= len(keys):
+        return np.argsort(keys, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(keys, k - 1)[:k]
+    return part[np.argsort(keys[part])]
+
+
+def cursor_after(keys: np.ndarray, cursor_key: Tuple[float, int]) -> np.ndarray:
+    """Masque des clés strictement après la clé (-score, rang) du curseur."""
+    neg_score, row = cursor_key
+    return keys > sort_key(-neg_score, row)
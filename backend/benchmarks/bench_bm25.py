@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Benchmark du classement BM25F vs part de mots-clés (keyword_score).
+
+Pour chaque requête : nombre de postings parcourus (tous champs), latence
+d'une première page de 50 résultats (vecteur de pertinence + score_rows +
+top-k) en mode keywords et bm25. Pour bm25, la latence « cold » inclut la
+conversion des postings en tableaux NumPy (premier appel après écriture),
+« warm » les réutilise. Affiche aussi le nombre de scores distincts dans la
+page : keyword_score donne le même score à toutes les offres « python ».
+
+Usage:
+    python benchmarks/bench_bm25.py [--sizes 100000,1000000] [--repeat 5]
+"""
+import argparse
+import time
+
+from corpus import synthetic_jobs
+
+from app.models import SearchRequest
+from app.storage.memory import MemoryStore
+from app.utils.bm25 import FIELD_PARAMS, query_terms
+from app.utils.scoring import cv_keyword_score
+from app.utils.vector_scoring import score_rows, top_k
+
+QUERIES = [["python"], ["python", "aws"], ["data", "engineer", "kafka", "spark"], ["ci/cd", "rust"]]
+PAGE = 50
+
+
+def page(store: MemoryStore, req: SearchRequest):
+    kw = store.bm25_vector(req.keywords) if req.ranking == "bm25" else store.keyword_vector(req.keywords)
+    scored = score_rows(store.columns, store.candidate_rows(req), req, kw, cv_keyword_score(req))
+    return scored.scores[top_k(scored.keys, PAGE)]
+
+
+def timed(fn, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def postings(store: MemoryStore, keywords) -> int:
+    index = store._text_index
+    return sum(len(index.postings[f].get(t, ())) for t in query_terms(keywords) for f in FIELD_PARAMS)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n in (int(s) for s in args.sizes.split(",")):
+        # Quasi-doublons sans effet sur le scoring mesuré ici (et lents à 1M)
+        store = MemoryStore(near_duplicates=False)
+        store.upsert_jobs(synthetic_jobs(n))
+        print(f"\n{n} jobs (ms par page de {PAGE}, scores distincts dans la page)")
+        print(f"{'keywords':<32} {'postings':>10} {'keywords':>9} {'bm25 cold':>10} {'bm25 warm':>10} {'distinct kw/bm25':>17}")
+        for keywords in QUERIES:
+            kw_req = SearchRequest(keywords=keywords)
+            bm_req = SearchRequest(keywords=keywords, ranking="bm25")
+            kw_ms, kw_page = timed(lambda: page(store, kw_req), args.repeat)
+            cold_ms, _ = timed(lambda: page(store, bm_req))
+            warm_ms, bm_page = timed(lambda: page(store, bm_req), args.repeat)
+            print(
+                f"{' '.join(keywords):<32} {postings(store, keywords):>10} {kw_ms:>9.1f} {cold_ms:>10.1f} "
+                f"{warm_ms:>10.1f} {len(set(kw_page)):>8}/{len(set(bm_page))}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+Benchmark du parsing de CV : re-parsing en masse des profils stockés.
+
+Compare l'ancien CVParser (patterns en chaînes brutes, un re.findall par
+pattern, scan des secteurs mot par mot) et le moteur compilé en une passe
+de app.services.cv_parser. Vérifie que les deux sorties sont identiques puis
+affiche le débit en CV/s.
+
+Les CV viennent des profils JSON de --profiles-dir ; s'il y en a moins que
+--count, le lot est complété par des CV synthétiques.
+
+Usage:
+    python benchmarks/bench_cv_parser.py [--count 5000] [--profiles-dir data/profiles] [--repeat 3]
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.cv_parser import cv_parser  # noqa: E402
+
+
+class LegacyCVParser:
+    """CVParser avant compilation, gardé ici comme référence."""
+
+    SKILL_PATTERNS = [
+        r"\b(python|java|javascript|typescript|react|vue|angular|node\.?js|go|golang|rust|c\+\+|c#|php|ruby|swift|kotlin|dart|scala|clojure|haskell|elixir|erlang)\b",
+        r"\b(kubernetes|docker|terraform|ansible|jenkins|gitlab|github|aws|azure|gcp|cloud)\b",
+        r"\b(postgresql|mysql|mongodb|redis|elasticsearch|kafka|rabbitmq|sql|nosql)\b",
+        r"\b(react|vue|angular|svelte|next\.?js|nuxt|gatsby|remix)\b",
+        r"\b(machine learning|ml|ai|deep learning|nlp|computer vision|tensorflow|pytorch)\b",
+        r"\b(devops|sre|ci/cd|agile|scrum|kanban)\b",
+    ]
+    EXPERIENCE_PATTERNS = [
+        r"(\d+)\s*(?:ans?|years?|années?)\s*(?:d'?expérience|of experience|exp)",
+        r"expérience\s*:\s*(\d+)",
+        r"(\d+)\+?\s*(?:ans?|years?)",
+    ]
+    LANGUAGE_PATTERN = r"\b(anglais|english|français|french|allemand|german|espagnol|spanish|italien|italian|chinois|chinese|japonais|japanese)\b"
+    LANG_MAP = {
+        "anglais": "Anglais", "english": "Anglais", "français": "Français", "french": "Français",
+        "allemand": "Allemand", "german": "Allemand", "espagnol": "Espagnol", "spanish": "Espagnol",
+    }
+    LEVEL_PATTERNS = [
+        (r"\b(junior|débutant|beginner|entry)\b", "Junior"),
+        (r"\b(mid|intermédiaire|intermediate|confirmé)\b", "Mid"),
+        (r"\b(senior|expert|lead|architect|principal)\b", "Senior"),
+    ]
+    SECTOR_KEYWORDS = {
+        "fintech": ["fintech", "finance", "banking", "banque"],
+        "e-commerce": ["e-commerce", "ecommerce", "retail", "commerce"],
+        "healthcare": ["healthcare", "santé", "médical", "health"],
+        "edtech": ["edtech", "éducation", "education", "formation"],
+        "saas": ["saas", "software as a service"],
+        "gaming": ["gaming", "jeu", "game"],
+    }
+
+    def parse_text(self, cv_text: str) -> dict:
+        text = cv_text.lower()
+        skills = set()
+        for pattern in self.SKILL_PATTERNS:
+            for match in re.findall(pattern, text, re.IGNORECASE):
+                skill = match.lower().replace(".", "").replace(" ", "")
+                if len(skill) > 2:
+                    skills.add(skill)
+        experience = None
+        for pattern in self.EXPERIENCE_PATTERNS:
+            match = re.search(pattern, cv_text, re.IGNORECASE)
+            if match:
+                experience = min(int(match.group(1)), 50)
+                break
+        level = next((lv for p, lv in self.LEVEL_PATTERNS if re.search(p, text, re.IGNORECASE)), None)
+        languages = {
+            self.LANG_MAP.get(m.lower(), m.lower().capitalize())
+            for m in re.findall(self.LANGUAGE_PATTERN, text, re.IGNORECASE)
+        }
+        sectors = [s for s, kws in self.SECTOR_KEYWORDS.items() if any(kw in text for kw in kws)]
+        return {
+            "skills": sorted(skills),
+            "experience_years": experience,
+            "experience_level": level,
+            "languages": sorted(languages),
+            "sectors": sectors,
+        }
+
+
+VOCABULARY = [
+    "Python", "FastAPI", "Django", "React", "Vue.js", "Node.js", "TypeScript", "Go", "Golang", "Kubernetes",
+    "Docker", "Terraform", "AWS", "GCP", "PostgreSQL", "MongoDB", "Kafka", "Redis", "machine learning", "NLP",
+    "CI/CD", "Scrum", "DevOps", "C++", "C#", "Anglais courant", "English", "Allemand", "Senior", "Lead",
+    "Junior", "confirmé", "fintech", "e-commerce", "santé", "formation", "jeu vidéo", "SaaS",
+]
+FILLER = (
+    "développement de services backend pour une équipe produit, revue de code, mise en production, "
+    "suivi des incidents, documentation technique, ateliers avec les utilisateurs, migration de données, "
+    "amélioration des performances et de la supervision, encadrement de stagiaires"
+).split()
+
+
+def synthetic_cvs(n: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    cvs = []
+    for _ in range(n):
+        lines = [f"{rng.choice(['Développeur', 'Ingénieur', 'Data Engineer'])} - {rng.randint(1, 20)} ans d'expérience"]
+        for _ in range(rng.randint(4, 10)):
+            words = rng.sample(FILLER, 12) + rng.sample(VOCABULARY, 3)
+            rng.shuffle(words)
+            lines.append(" ".join(words) + ".")
+        cvs.append("\n".join(lines))
+    return cvs
+
+
+def stored_cvs(profiles_dir: Path) -> list:
+    cvs = []
+    for path in sorted(profiles_dir.glob("*.json")):
+        try:
+            cv_text = json.loads(path.read_text(encoding="utf-8")).get("cv_text")
+        except (OSError, ValueError):
+            continue
+        if cv_text:
+            cvs.append(cv_text)
+    return cvs
+
+
+def bench(parse, cvs: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for cv_text in cvs:
+            parse(cv_text)
+        best = min(best, time.perf_counter() - start)
+    return len(cvs) / best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--profiles-dir", default=str(backend_dir / "data" / "profiles"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cvs = stored_cvs(Path(args.profiles_dir))
+    stored = len(cvs)
+    cvs += synthetic_cvs(max(args.count - stored, 0))
+    print(f"{len(cvs)} CVs ({stored} from stored profiles), avg {sum(map(len, cvs)) / len(cvs):.0f} chars")
+
+    legacy = LegacyCVParser()
+    for cv_text in cvs:
+        assert legacy.parse_text(cv_text) == cv_parser.parse_text(cv_text), cv_text[:200]
+
+    legacy_rate = bench(legacy.parse_text, cvs, args.repeat)
+    compiled_rate = bench(cv_parser.parse_text, cvs, args.repeat)
+    print(f"{'parser':<10} {'CVs/s':>10} {'speedup':>8}")
+    print(f"{'legacy':<10} {legacy_rate:>10.0f} {1.0:>7.1f}x")
+    print(f"{'compiled':<10} {compiled_rate:>10.0f} {compiled_rate / legacy_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
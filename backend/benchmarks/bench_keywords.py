@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Benchmark du scoring mots-clés : sous-chaînes sur chaque offre vs index inversé.
+
+Usage:
+    python benchmarks/bench_keywords.py [--sizes 10000,100000]
+"""
+import argparse
+import time
+
+from corpus import synthetic_jobs
+
+from app.storage.memory import MemoryStore
+from app.utils.scoring import keyword_score
+
+QUERIES = [["python"], ["python", "aws"], ["rust", "ci/cd"], ["machine learning"], ["snowflake", "dbt", "airflow"]]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    args = parser.parse_args()
+
+    print(f"{'postings':>10} {'keywords':<28} {'matches':>8} {'scan ms':>9} {'index ms':>9}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        store = MemoryStore()
+        store.upsert_jobs(synthetic_jobs(size))
+        jobs = store.search()
+        for keywords in QUERIES:
+            start = time.perf_counter()
+            scan = {}
+            for job in jobs:
+                score = keyword_score(keywords, f"{job.title} {job.description or ''}")
+                if score:
+                    scan[job.id] = score
+            scan_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            hits = store.keyword_hits(keywords)
+            index_s = time.perf_counter() - start
+
+            assert scan == {i: h / len(keywords) for i, h in hits.items()}
+            print(f"{size:>10} {' '.join(keywords):<28} {len(hits):>8} {scan_s * 1000:>9.1f} {index_s * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark du parsing HTML des connecteurs sur des pages figées.
+
+Compare, pour chaque connecteur, le parseur historique (html.parser, page
+complète), lxml sur la page complète, et lxml limité aux cartes (strainer).
+Affiche le nombre de cartes parsées par seconde.
+
+Usage:
+    python benchmarks/bench_parsing.py [--repeat 50]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Ajouter backend au path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.connectors import apec, indeed, parsing, scraper  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+CONNECTORS = {
+    "wttj": (scraper, scraper._parse_wttj),
+    "remotive": (scraper, scraper._parse_remotive),
+    "apec": (apec, apec._parse_page),
+    "indeed": (indeed, indeed._parse_page),
+}
+
+MODES = {
+    "html.parser": lambda html, strainer=None: BeautifulSoup(html, "html.parser"),
+    "lxml": lambda html, strainer=None: BeautifulSoup(html, "lxml"),
+    "lxml+strainer": parsing.parse_html,
+}
+
+
+def bench(module, parse, html: str, repeat: int, mode: str) -> tuple[int, float]:
+    original = module.parse_html
+    module.parse_html = MODES[mode]
+    try:
+        cards = len(parse(html))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parse(html)
+        elapsed = time.perf_counter() - start
+    finally:
+        module.parse_html = original
+    return cards, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'connector':<10} {'mode':<14} {'cards':>5} {'cards/s':>10} {'speedup':>8}")
+    for name, (module, parse) in CONNECTORS.items():
+        html = (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+        baseline = None
+        for mode in MODES:
+            cards, elapsed = bench(module, parse, html, args.repeat, mode)
+            rate = cards * args.repeat / elapsed
+            baseline = baseline or rate
+            print(f"{name:<10} {mode:<14} {cards:>5} {rate:>10.0f} {rate / baseline:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
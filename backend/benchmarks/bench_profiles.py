@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Benchmark des stores de profils : fichiers JSON vs SQLite.
+
+Crée --users profils (CV texte d'environ 1 Ko) dans un répertoire temporaire
+pour chaque backend, puis mesure en opérations/s :
+- create : création un par un (une écriture par profil) ;
+- get cold : lecture sur un store fraîchement ouvert (cache vide) ;
+- get warm : relecture des mêmes profils (cache) ;
+- update : mise à jour d'un champ (une écriture) ;
+- burst : 5 mises à jour successives du même profil ;
+- get_many : lots de 100 profils sur un store fraîchement ouvert.
+Affiche aussi la taille sur disque. Le backend JSON est mesuré en écriture
+synchrone (json) et différée (json+wb, --write-delay) ; les temps d'écriture
+incluent le flush final.
+
+Usage:
+    python benchmarks/bench_profiles.py [--users 100000] [--sample 10000] [--write-delay 0.2]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.models.profile import ProfileCreate, ProfileUpdate  # noqa: E402
+from app.storage.profile_sqlite import SQLiteProfileStore  # noqa: E402
+from app.storage.profile_store import ProfileStore  # noqa: E402
+
+SKILLS = ["python", "java", "react", "kubernetes", "docker", "aws", "kafka", "postgresql", "rust", "go"]
+BATCH = 100
+
+
+def profiles(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    for i in range(n):
+        skills = rng.sample(SKILLS, 4)
+        yield ProfileCreate(
+            user_id=f"user{i}@example.com",
+            full_name=f"User {i}",
+            cv_text=(f"Développeur {' '.join(skills)}, {rng.randint(1, 20)} ans d'expérience. " * 12)[:1000],
+            preferred_contract_types=rng.sample(["CDI", "CDD", "Freelance"], 2),
+            preferred_countries=["fr"],
+            salary_min=rng.choice([None, 40000, 55000]),
+        ), {"skills": skills, "experience_level": rng.choice(["Junior", "Mid", "Senior"])}
+
+
+def disk_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def rate(n: int, start: float) -> str:
+    return f"{n / (time.perf_counter() - start):>10.0f}"
+
+
+def run(name: str, open_store, root: Path, users: int, sample: int) -> None:
+    store = open_store()
+    start = time.perf_counter()
+    for profile_data, parsed in profiles(users):
+        store.create(profile_data, parsed)
+    store.flush()
+    create = rate(users, start)
+
+    rng = random.Random(1)
+    ids = [f"user{rng.randrange(users)}@example.com" for _ in range(sample)]
+
+    store = open_store()
+    start = time.perf_counter()
+    for user_id in ids:
+        assert store.get(user_id) is not None
+    cold = rate(sample, start)
+
+    start = time.perf_counter()
+    for user_id in ids:
+        store.get(user_id)
+    warm = rate(sample, start)
+
+    start = time.perf_counter()
+    for user_id in ids:
+        store.update(user_id, ProfileUpdate(salary_min=rng.randrange(30000, 80000)))
+    store.flush()
+    update = rate(sample, start)
+
+    # Rafale : 5 mises à jour successives par profil (upload de CV, formulaire...)
+    start = time.perf_counter()
+    for user_id in ids[: sample // 5]:
+        for _ in range(5):
+            store.update(user_id, ProfileUpdate(salary_min=rng.randrange(30000, 80000)))
+    store.flush()
+    burst = rate(sample // 5 * 5, start)
+
+    store = open_store()
+    start = time.perf_counter()
+    for i in range(0, sample, BATCH):
+        assert len(store.get_many(ids[i:i + BATCH])) == len(set(ids[i:i + BATCH]))
+    many = rate(sample, start)
+
+    print(f"{name:<8} {create} {cold} {warm} {update} {burst} {many} {disk_size(root) / 2**20:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=10_000)
+    parser.add_argument("--write-delay", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{args.users} users, {args.sample} sampled ops (ops/s)")
+    print(f"{'backend':<8} {'create':>10} {'get cold':>10} {'get warm':>10} {'update':>10} {'burst':>10} {'get_many':>10} {'disk MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "json"
+        run("json", lambda: ProfileStore(str(root), write_delay=0), root, args.users, args.sample)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "json"
+        run("json+wb", lambda: ProfileStore(str(root), write_delay=args.write_delay), root, args.users, args.sample)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        run("sqlite", lambda: SQLiteProfileStore(str(root / "profiles.db")), root, args.users, args.sample)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmark de la recherche sémantique : index IVF vs recherche exacte.
+
+Pour chaque taille de corpus synthétique :
+- indexation : offres/s de MemoryStore.upsert_jobs sans et avec embeddings ;
+- requêtes (mots-clés + résumé CV tirés du vocabulaire du corpus) : latence
+  moyenne et recall@k de l'IVF par rapport au top-k exact (produit scalaire
+  sur tous les vecteurs ; les ex aequo du k-ième voisin comptent comme
+  trouvés), pour plusieurs valeurs de nprobe ;
+- rechargement d'un SQLiteStore : sans fichier de vecteurs (tout est
+  recalculé) puis avec (vecteurs relus du memmap).
+
+Usage:
+    python benchmarks/bench_semantic.py [--sizes 10000,100000] [--k 100] [--queries 200]
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from corpus import ROLES, SKILLS, synthetic_jobs
+
+from app.config import settings
+from app.storage.memory import MemoryStore
+from app.storage.sqlite_store import SQLiteStore
+from app.utils.embeddings import embed_query
+
+NPROBES = [1, 4, 8, 16, 32, 64]
+BATCH = 1000
+
+
+def queries(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield " ".join([rng.choice(ROLES), *rng.sample(SKILLS, rng.randint(1, 4))])
+
+
+def build(jobs, semantic: bool) -> tuple:
+    store = MemoryStore(semantic=semantic)
+    start = time.perf_counter()
+    for i in range(0, len(jobs), BATCH):
+        store.upsert_jobs(jobs[i:i + BATCH])
+    return store, len(jobs) / (time.perf_counter() - start)
+
+
+def exact_top(index, query, k):
+    rows = np.flatnonzero(index.present[: index.size])
+    sims = index.vectors[rows].astype(np.float32) @ query
+    return rows, sims, np.sort(sims)[::-1][min(k, len(sims)) - 1]
+
+
+def bench_size(n: int, k: int, n_queries: int) -> None:
+    jobs = synthetic_jobs(n)
+    _, plain_rate = build(jobs, semantic=False)
+    store, semantic_rate = build(jobs, semantic=True)
+    index = store._vectors
+    print(f"\n{n} jobs — upsert {plain_rate:.0f} jobs/s sans embeddings, {semantic_rate:.0f} jobs/s avec")
+
+    texts = list(queries(n_queries))
+    vectors = [embed_query(text, store.term_idf) for text in texts]
+    index.search(vectors[0], k, 1)  # entraînement des centroïdes hors mesure
+
+    start = time.perf_counter()
+    exact = []
+    for q in vectors:
+        rows, sims, kth = exact_top(index, q, k)
+        top = np.argpartition(-sims, k - 1)[:k]
+        exact.append((set(rows[sims >= kth - 1e-3].tolist()), rows[top]))
+    exact_ms = (time.perf_counter() - start) * 1000 / n_queries
+    print(f"{'nprobe':>8} {'recall@' + str(k):>10} {'ms/query':>10}")
+    print(f"{'exact':>8} {1.0:>10.3f} {exact_ms:>10.2f}")
+
+    for nprobe in NPROBES:
+        start = time.perf_counter()
+        found = [index.search(q, k, nprobe) for q in vectors]
+        ms = (time.perf_counter() - start) * 1000 / n_queries
+        recall = np.mean([
+            min(1.0, len(set(rows.tolist()) & ties) / min(k, len(ties)))
+            for rows, (ties, _) in zip(found, exact)
+        ])
+        print(f"{nprobe:>8} {recall:>10.3f} {ms:>10.2f}")
+
+    settings.semantic_search = True
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "jobs.db")
+        writer = SQLiteStore(path)
+        for i in range(0, n, BATCH):
+            writer.upsert_jobs(jobs[i:i + BATCH])
+        writer.close()
+        Path(path).with_suffix(".vectors").unlink()
+        for label in ("cold (sans .vectors)", "warm (memmap)"):
+            start = time.perf_counter()
+            SQLiteStore(path).close()
+            print(f"reload {label}: {time.perf_counter() - start:.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    for n in (int(s) for s in args.sizes.split(",")):
+        bench_size(n, args.k, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Benchmark de recherche : scan complet vs candidats réduits par les index du store.
+
+Pour une requête à filtres stricts, compare :
+- scan : store.search() puis score sur tout le corpus, filtrage après coup
+- index : store.search(req) (filtres via index) puis score sur les candidats
+
+Usage:
+    python benchmarks/bench_store.py [--sizes 10000,100000,1000000]
+"""
+import argparse
+import time
+
+from corpus import synthetic_jobs
+
+from app.models import SearchRequest
+from app.storage.memory import MemoryStore
+from app.utils.scoring import constraint_penalty, score
+
+REQUEST = SearchRequest(
+    keywords=["python", "aws"],
+    countries=["fr"],
+    contract_types=["CDI"],
+    remote_preference="remote",
+    salary_min=50000,
+    strict_filters=True,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    args = parser.parse_args()
+
+    print(f"{'postings':>10} {'candidates':>10} {'scan ms':>10} {'index ms':>10} {'speedup':>8}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        store = MemoryStore()
+        store.upsert_jobs(synthetic_jobs(size))
+
+        start = time.perf_counter()
+        scanned = [score(j, REQUEST) for j in store.search() if constraint_penalty(j, REQUEST) == 0]
+        scan = time.perf_counter() - start
+
+        store.search(REQUEST)  # tri salaire construit une fois
+        start = time.perf_counter()
+        indexed = [score(j, REQUEST) for j in store.search(REQUEST)]
+        index = time.perf_counter() - start
+
+        assert [s.job_id for s in scanned] == [s.job_id for s in indexed]
+        print(f"{size:>10} {len(indexed):>10} {scan * 1000:>10.1f} {index * 1000:>10.1f} {scan / index:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
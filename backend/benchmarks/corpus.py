@@ -0,0 +1,71 @@
+"""
+Corpus synthétique d'offres pour les benchmarks (pas de réseau).
+
+Les chaînes viennent de petits vocabulaires partagés pour limiter la mémoire
+à 1M d'offres ; `JobPosting.model_construct` évite la validation Pydantic.
+"""
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.models import JobPosting  # noqa: E402
+
+SOURCES = ["indeed", "apec", "welcometothejungle", "remotive", "adzuna", "eures", "france_travail"]
+COUNTRIES = ["fr", "FR", "de", "be", "international", None]
+CONTRACTS = ["CDI", "CDD", "Freelance", "Internship", "Permanent", None]
+REMOTES = ["remote", "hybrid", "onsite", None]
+ROLES = [
+    "Développeur Python", "Data Engineer", "DevOps Kubernetes", "Lead Dev React", "Ingénieur Cloud AWS",
+    "Backend Go", "Data Scientist", "SRE", "Architecte Java Spring", "QA Automation", "Mobile Flutter",
+    "ML Engineer", "Security Engineer", "Frontend Vue", "Rust Developer", "Fullstack Node.js",
+]
+LEVELS = ["Junior", "Confirmé", "Senior", "Lead", "Stagiaire", ""]
+SKILLS = [
+    "python", "fastapi", "django", "react", "typescript", "kubernetes", "docker", "terraform", "aws",
+    "gcp", "azure", "spark", "kafka", "postgres", "mongodb", "java", "spring", "go", "rust", "node",
+    "flutter", "swift", "kotlin", "pytorch", "tensorflow", "airflow", "dbt", "snowflake", "graphql", "redis",
+]
+COMPANIES = [f"Company {i}" for i in range(500)]
+CITIES = ["Paris", "Lyon", "Nantes", "Bordeaux", "Lille", "Toulouse", "Berlin", "Bruxelles", None]
+
+
+def synthetic_jobs(n: int, seed: int = 42) -> List[JobPosting]:
+    rng = random.Random(seed)
+    descriptions = [
+        " ".join(rng.sample(SKILLS, 6)) + " — équipe produit, CI/CD, revue de code, " + rng.choice(SKILLS)
+        for _ in range(2000)
+    ]
+    titles = [f"{role} {level}".strip() for role in ROLES for level in LEVELS]
+    jobs = []
+    for i in range(n):
+        salary = rng.choice([None, None, 35000.0, 45000.0, 55000.0, 65000.0, 80000.0])
+        jobs.append(
+            JobPosting.model_construct(
+                id=f"job-{i}",
+                source=rng.choice(SOURCES),
+                source_job_id=str(i),
+                title=rng.choice(titles),
+                company=rng.choice(COMPANIES),
+                country=rng.choice(COUNTRIES),
+                city=rng.choice(CITIES),
+                remote_type=rng.choice(REMOTES),
+                contract_type=rng.choice(CONTRACTS),
+                experience_level=None,
+                salary_min=salary,
+                salary_max=salary + 10000 if salary else None,
+                currency="EUR" if salary else None,
+                salary_period="year" if salary else None,
+                salary_confidence=None,
+                description=rng.choice(descriptions),
+                skills=rng.sample(SKILLS, 3),
+                posted_at=None,
+                apply_url=None,
+                match_score=None,
+                reasons=[],
+            )
+        )
+    return jobs
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Migration des anciens ids positionnels (wttj-3, remotive-7, apec-12,
+indeed-indeed-4) vers les ids stables des connecteurs (app/utils/ids.py).
+
+Les offres dont le nouvel id existe déjà sont supprimées (doublons créés par
+les anciens ids). Le cache HTTP (HTTP_CACHE_DIR) est ensuite vidé : ses
+offres extraites portent les ids d'avant la migration. À lancer API et
+scraper arrêtés.
+
+Usage:
+    python migrate_job_ids.py [--dry-run]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ajouter le dossier backend au path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.connectors.http_client import http_client  # noqa: E402
+from app.storage.jobs import store  # noqa: E402
+from app.storage.sqlite_store import SQLiteStore  # noqa: E402
+from app.utils.ids import migrated_id  # noqa: E402
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-key des offres stockées avec des ids positionnels")
+    parser.add_argument("--dry-run", action="store_true", help="Affiche les changements sans écrire")
+    args = parser.parse_args()
+
+    if not isinstance(store, SQLiteStore):
+        print("Store en mémoire : rien à migrer.")
+        sys.exit(0)
+
+    rekeyed = {}
+    for job in store.search():
+        new_id = migrated_id(job)
+        if new_id:
+            rekeyed[job.id] = job.model_copy(update={"id": new_id, "source_job_id": new_id.split("-", 1)[1]})
+
+    print(f"{len(rekeyed)} offres à migrer sur {len(store)}")
+    for old_id, job in list(rekeyed.items())[:10]:
+        print(f"  {old_id} -> {job.id}")
+
+    if args.dry_run:
+        sys.exit(0)
+
+    if rekeyed:
+        renamed, merged = store.rekey_jobs(rekeyed)
+        print(f"✅ {renamed} renommées, {merged} doublons supprimés ({len(store)} offres)")
+
+    # Pages en cache : offres extraites avec les anciens ids, à ne plus resservir
+    if http_client.cache is not None:
+        cleared = http_client.cache.clear()
+        print(f"🧹 Cache HTTP vidé ({cleared} pages)")
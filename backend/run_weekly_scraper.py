@@ -3,11 +3,12 @@
 Script standalone pour lancer le scraper hebdomadaire.
 
 Usage:
-    python run_weekly_scraper.py
+    python run_weekly_scraper.py [--workers N]
 
 Ou avec Windows Task Scheduler:
     C:\path\to\venv\Scripts\python.exe C:\path\to\backend\run_weekly_scraper.py
 """
+import argparse
 import sys
 from pathlib import Path
 
@@ -18,17 +19,31 @@ sys.path.insert(0, str(backend_dir))
 from app.scheduler.weekly_scraper import run_weekly_scraper
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraping hebdomadaire des offres")
+    parser.add_argument("--workers", type=int, default=None, help="Requêtes en parallèle (1 = séquentiel)")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("WEEKLY JOB SCRAPER")
     print("=" * 60)
     
-    result = run_weekly_scraper()
+    result = run_weekly_scraper(workers=args.workers)
     
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
     print(f"✅ Scraped: {result['scraped']} jobs")
-    print(f"✅ Stored: {result['stored']} unique jobs")
+    print(f"✅ Unique: {result['unique']} jobs (all queries)")
+    print(f"✅ Stored: {result['stored']} new or changed jobs")
+    print(
+        f"🔁 New: {result['new']}, changed: {result['changed']}, "
+        f"unchanged: {result['unchanged']}, expired: {result['expired']}"
+    )
+    
+    timings = result["timings"]
+    print(f"⏱️  Duration: {timings['total_seconds']}s ({timings['workers']} workers)")
+    for name, stats in sorted(timings["sources"].items(), key=lambda kv: -kv[1]["seconds"]):
+        print(f"   - {name}: {stats['seconds']}s cumulés, max {stats['max_seconds']}s, {stats['jobs']} jobs")
     
     if result['errors']:
         print(f"⚠️  Errors: {len(result['errors'])}")
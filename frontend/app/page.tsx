@@ -26,7 +26,15 @@ type SearchResponse = {
   items: JobPosting[];
 };
 
+type IngestStatus = {
+  job_id: string;
+  status: "pending" | "running" | "done" | "error";
+  error?: string | null;
+};
+
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE ?? "http://localhost:8000";
+const INGEST_POLL_MS = 1000;
+const INGEST_TIMEOUT_MS = 60000;
 
 
 const IT_CATEGORIES = [
@@ -71,6 +79,18 @@ export default function Page() {
     );
   };
 
+  async function waitForIngest(jobId: string) {
+    // Polling du statut ; on cherche quand même après INGEST_TIMEOUT_MS (offres déjà en base)
+    const deadline = Date.now() + INGEST_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+      const res = await fetch(`${API_BASE}/ingest/${jobId}`);
+      if (!res.ok) return;
+      const status: IngestStatus = await res.json();
+      if (status.status === "done" || status.status === "error") return;
+      await new Promise((resolve) => setTimeout(resolve, INGEST_POLL_MS));
+    }
+  }
+
   async function runSearch(e: FormEvent) {
     e.preventDefault();
     setLoading(true);
@@ -85,12 +105,16 @@ export default function Page() {
         cv_summary: cvSummary || null,
       };
 
-      // 1) ingest
-      await fetch(`${API_BASE}/ingest`, {
+      // 1) ingest (tâche de fond) puis attente de la fin de la collecte
+      const ingestRes = await fetch(`${API_BASE}/ingest`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(requestBody),
       });
+      if (ingestRes.ok) {
+        const job: IngestStatus = await ingestRes.json();
+        await waitForIngest(job.job_id);
+      }
       // 2) search (avec user_id si fourni)
       const searchUrl = userId
         ? `${API_BASE}/search?user_id=${encodeURIComponent(userId)}`